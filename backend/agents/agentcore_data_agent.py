@@ -125,11 +125,13 @@ config = None
 db = None
 
 
+# Parameter Store client, created once per container
+ssm_client = boto3.client('ssm', region_name='us-west-2')
+
+
 def load_config() -> DataAgentConfig:
     """Load configuration from AWS Systems Manager Parameter Store"""
     try:
-        ssm_client = boto3.client('ssm', region_name='us-west-2')
-        
         # Get parameters from Parameter Store
         parameter_names = [
             '/agentcore/data-agent/aws-region',
@@ -11,6 +11,10 @@ from typing import Dict, Any
 from direct_agent_client import create_client
 from auth_handler import verify_token
 
+# Warm up the shared client during container init, so the first request
+# doesn't pay for credentials and DNS lookups
+create_client().warmup()
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -6,21 +6,200 @@ This client implements the agent functionality directly without requiring AgentC
 It provides the same interface as the AgentCore HTTP client but implements the business logic locally.
 """
 
+import functools
 import json
-import boto3
 import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import date
 import uuid
+from urllib.parse import urlparse
+
+# orjson decodes the Data API's JSON records several times faster than the
+# standard library; fall back to json where it isn't packaged
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+AWS_REGION = os.getenv('AWS_REGION', 'us-west-2')
+
+# AWS clients are created once per Lambda container, on first use, and reused
+# by every warm invocation along with their connection pools; see _init_clients()
+_RDS = None
+_BEDROCK = None
+
+# Upgrade tiers from lowest to highest, with their position for O(1) lookups
+TIER_ORDER = ('Standard', 'Non-stop', 'Double Fun')
+TIER_INDEX = {tier: i for i, tier in enumerate(TIER_ORDER)}
+
+# Base upgrade price per tier
+BASE_PRICES = {
+    'Standard': 50.0,
+    'Non-stop': 150.0,
+    'Double Fun': 300.0
+}
+
+# Seasonal price multiplier indexed by (is_weekend << 1) | is_holiday_season:
+# weekends add 0.2 and the Nov-Jan holiday season adds 0.3
+_MULT = (1.0, 1.3, 1.2, 1.5)
+
+# Final upgrade price for every (tier, multiplier index) pair
+UPGRADE_PRICES = {
+    (tier, key): base * multiplier
+    for tier, base in BASE_PRICES.items()
+    for key, multiplier in enumerate(_MULT)
+}
+
+# SQL statements, built once at import; tickets are looked up by 'id', their primary key
+GET_TICKET_SQL = (
+    "SELECT id AS ticket_id, customer_id, ticket_number, ticket_type, original_price, "
+    "purchase_date, event_date, status FROM tickets WHERE id = :ticket_id::uuid"
+)
+
+GET_CUSTOMER_SQL = (
+    "SELECT id AS customer_id, email, cognito_user_id, first_name, last_name, phone, created_at "
+    "FROM customers WHERE id = :customer_id"
+)
+
+GET_CUSTOMER_TICKETS_SQL = """
+SELECT t.id AS ticket_id, t.customer_id, t.ticket_number, t.ticket_type, t.original_price,
+       t.purchase_date, t.event_date, t.status, t.metadata, t.created_at, t.updated_at,
+       c.first_name, c.last_name
+FROM tickets t 
+JOIN customers c ON t.customer_id = c.id 
+WHERE t.customer_id = :customer_id
+"""
+
+# Shared by create_upgrade_order and the batched create_upgrade_orders
+INSERT_UPGRADE_ORDER_SQL = """
+INSERT INTO upgrade_orders (order_id, customer_id, ticket_id, upgrade_tier, 
+                          travel_date, total_amount, status, created_at)
+VALUES (:order_id, :customer_id, :ticket_id, :upgrade_tier, 
+        :travel_date, :total_amount, 'pending', NOW())
+"""
+
+# LLM prompt templates, filled in with str.format
+PRICING_PROMPT = (
+    "Explain the pricing for upgrading a ticket from {current_tier} to {upgrade_tier}.\n"
+    "The base price is ${base_price:.2f} and the final price "
+    "is ${final_price:.2f} with multiplier {multiplier:.2f}.\n"
+    "Weekend: {is_weekend}, Holiday season: {is_holiday_season}.\n"
+    "Provide a brief, customer-friendly explanation."
+)
+
+RECOMMENDATIONS_PROMPT = (
+    "Provide upgrade recommendations for a {customer_tier} tier customer named {customer_name} "
+    "who has a {current_tier} ticket for {event_name} on {event_date}.\n\n"
+    "Available upgrade tiers: " + ", ".join(TIER_ORDER) + "\n"
+    "Current tier: {current_tier}\n\n"
+    "Consider the customer's tier status and provide personalized recommendations with reasons.\n"
+    "Format as a JSON-like structure with recommendations."
+)
+
+# Price range and features shown for each tier
+TIER_INFO = {
+    'Standard': {'price_range': '$50-70', 'features': ['Priority boarding', 'Extra legroom']},
+    'Non-stop': {'price_range': '$150-200', 'features': ['Premium seating', 'Complimentary drinks', 'Fast track entry']},
+    'Double Fun': {'price_range': '$300-400', 'features': ['VIP experience', 'Meet & greet', 'Exclusive merchandise']}
+}
+
+# Runs Bedrock calls in the background so slow LLM responses overlap with
+# the rest of a request's work
+_llm_executor = ThreadPoolExecutor(max_workers=4)
+
+# Runs Data API queries that don't depend on each other side by side
+_db_executor = ThreadPoolExecutor(max_workers=4)
+
+# Shared client instance, see create_client()
+_instance = None
+
+# One upgrade flow calls several agent methods for the same ticket; keep each
+# fetched row for a few seconds so they share a single Data API round-trip.
+# Least recently used first, and bounded so a warm container can't grow it.
+# _db_executor threads use it too, so every access holds the lock
+TICKET_CACHE_TTL = 5
+TICKET_CACHE_SIZE = 256
+_ticket_cache = OrderedDict()
+_ticket_cache_lock = threading.Lock()
+
+
+# Pricing explanations keyed by the inputs of their prompt, least recently
+# used first; the prompt has no free-form fields, so repeat quotes hit often
+PRICING_EXPLANATION_CACHE_SIZE = 2048
+_pricing_explanations = OrderedDict()
+
+
+def _init_clients():
+    """Create the shared RDS Data API and Bedrock clients on first use
+    
+    boto3 is imported here rather than at module load, so code paths that
+    never talk to AWS (health checks, local tests) skip its import cost.
+    Both clients fail fast on unreachable endpoints and retry at most once,
+    so a slow dependency shows up as an error instead of minutes of backoff.
+    """
+    global _RDS, _BEDROCK
+    if _RDS is None:
+        import boto3
+        from botocore.config import Config
+        
+        config = Config(
+            retries={'max_attempts': 2, 'mode': 'standard'},
+            connect_timeout=1.0,
+            read_timeout=10.0,
+            max_pool_connections=50,
+            tcp_keepalive=True
+        )
+        
+        _RDS = boto3.client('rds-data', region_name=AWS_REGION, config=config)
+        # Generating an LLM response can take longer than a Data API query
+        _BEDROCK = boto3.client('bedrock-runtime', region_name=AWS_REGION,
+                                config=config.merge(Config(read_timeout=30.0)))
+    return _RDS, _BEDROCK
+
+
+def _wrap_errors(prefix: str = ''):
+    """Turn exceptions raised by a public agent method into an error result
+    
+    Internal helpers just raise; the outermost public method converts the
+    failure once, as {'success': False, 'error': prefix + message}.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                return {'success': False, 'error': f'{prefix}{e}'}
+        return wrapper
+    return decorator
+
+
+def _sp(name: str, value: Any, kind: str = 'stringValue') -> Dict[str, Any]:
+    """Build a Data API SQL parameter, e.g. _sp('ticket_id', ticket_id)"""
+    return {'name': name, 'value': {kind: value}}
+
+
+def _rows(data: Dict[str, Any]) -> list:
+    """Decode an execute_statement response into dicts keyed by column name
+
+    Needs formatRecordsAs='JSON' (as_json=True in _execute_sql), so the Data
+    API returns the rows already keyed by column label instead of as
+    positional typed fields that would have to be unwrapped one by one.
+    """
+    return _json_loads(data.get('formattedRecords') or '[]')
 
 
 class DirectAgentClient:
     """Direct implementation of agent functionality"""
     
     def __init__(self):
-        # Initialize AWS clients
-        self.rds_client = boto3.client('rds-data', region_name='us-west-2')
-        self.bedrock_client = boto3.client('bedrock-runtime', region_name='us-west-2')
+        # Reuse the shared AWS clients
+        self.rds_client, self.bedrock_client = _init_clients()
         
         # Database configuration
         self.db_cluster_arn = os.getenv('DB_CLUSTER_ARN')
@@ -30,27 +209,49 @@ class DirectAgentClient:
         # Bedrock configuration
         self.model_id = os.getenv('BEDROCK_MODEL_ID', 'us.amazon.nova-pro-v1:0')
     
-    def _execute_sql(self, sql: str, parameters: list = None) -> Dict[str, Any]:
-        """Execute SQL query using RDS Data API"""
-        try:
-            params = {
-                'resourceArn': self.db_cluster_arn,
-                'secretArn': self.db_secret_arn,
-                'database': self.database_name,
-                'sql': sql
-            }
-            
-            if parameters:
-                params['parameters'] = parameters
-            
-            response = self.rds_client.execute_statement(**params)
-            return {'success': True, 'data': response}
-            
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+    def warmup(self) -> None:
+        """Resolve the AWS endpoints ahead of the first request
+        
+        Meant for a handler's module init, which runs once per Lambda container
+        and has a 10 s limit. Credentials are already resolved when the clients
+        are created; this adds the DNS lookups for the Data API and Bedrock
+        endpoints. No query is sent, so init never resumes a paused Aurora
+        cluster or waits on the Data API. Failures are ignored, since the first
+        real request will surface them anyway.
+        """
+        for client in (self.rds_client, self.bedrock_client):
+            try:
+                socket.getaddrinfo(urlparse(client.meta.endpoint_url).hostname, 443)
+            except Exception:
+                pass
     
-    def _call_llm(self, prompt: str) -> str:
-        """Call Nova Pro LLM for reasoning"""
+    def _execute_sql(self, sql: str, parameters: list = None, as_json: bool = False) -> Dict[str, Any]:
+        """Execute SQL query using RDS Data API and return the raw response
+
+        Pass as_json=True for queries whose rows are decoded with _rows().
+        Errors propagate to the calling public method.
+        """
+        params = {
+            'resourceArn': self.db_cluster_arn,
+            'secretArn': self.db_secret_arn,
+            'database': self.database_name,
+            'sql': sql
+        }
+        
+        if as_json:
+            params['formatRecordsAs'] = 'JSON'
+        
+        if parameters:
+            params['parameters'] = parameters
+        
+        return self.rds_client.execute_statement(**params)
+    
+    def _call_llm(self, prompt: str, max_tokens: int = 200, temperature: float = 0.2) -> str:
+        """Call Nova Pro LLM for reasoning
+
+        Generation time grows with output length, so callers cap max_tokens
+        at what their answer needs.
+        """
         try:
             request_body = {
                 "messages": [
@@ -60,8 +261,8 @@ class DirectAgentClient:
                     }
                 ],
                 "inferenceConfig": {
-                    "maxTokens": 1000,
-                    "temperature": 0.7
+                    "maxTokens": max_tokens,
+                    "temperature": temperature
                 }
             }
             
@@ -76,371 +277,388 @@ class DirectAgentClient:
         except Exception as e:
             return f"LLM Error: {str(e)}"
     
+    def _submit_llm(self, prompt: str, **kwargs) -> Future:
+        """Start an LLM call in the background; the Future resolves to _call_llm's result"""
+        return _llm_executor.submit(self._call_llm, prompt, **kwargs)
+    
+    def _fetch_ticket(self, ticket_id: str) -> Dict[str, Any]:
+        """Fetch a ticket row, reusing one fetched within TICKET_CACHE_TTL seconds
+
+        Returns a copy, so callers can't change the cached row.
+        Raises LookupError when the ticket doesn't exist.
+        """
+        now = time.time()
+        with _ticket_cache_lock:
+            cached = _ticket_cache.get(ticket_id)
+            if cached:
+                if cached[0] > now:
+                    _ticket_cache.move_to_end(ticket_id)
+                    return dict(cached[1])
+                del _ticket_cache[ticket_id]
+        
+        rows = _rows(self._execute_sql(GET_TICKET_SQL, [_sp('ticket_id', ticket_id)], as_json=True))
+        if not rows:
+            raise LookupError(f'Ticket {ticket_id} not found')
+        
+        ticket = rows[0]
+        ticket['original_price'] = float(ticket['original_price'])
+        
+        with _ticket_cache_lock:
+            _ticket_cache[ticket_id] = (now + TICKET_CACHE_TTL, ticket)
+            if len(_ticket_cache) > TICKET_CACHE_SIZE:
+                _ticket_cache.popitem(last=False)
+        return dict(ticket)
+    
+    @staticmethod
+    def _forget_tickets(ticket_ids) -> None:
+        """Drop cached rows for tickets that were just written to"""
+        with _ticket_cache_lock:
+            for ticket_id in ticket_ids:
+                _ticket_cache.pop(ticket_id, None)
+    
+    def _fetch_customer(self, customer_id: str) -> Dict[str, Any]:
+        """Fetch a customer row; raises LookupError when the customer doesn't exist"""
+        rows = _rows(self._execute_sql(GET_CUSTOMER_SQL, [_sp('customer_id', customer_id)], as_json=True))
+        if not rows:
+            raise LookupError(f'Customer {customer_id} not found')
+        return rows[0]
+    
     # Data Agent methods
+    @_wrap_errors()
     def get_customer(self, customer_id: str) -> Dict[str, Any]:
         """Get customer by ID"""
-        try:
-            sql = "SELECT * FROM customers WHERE id = :customer_id"
-            parameters = [{'name': 'customer_id', 'value': {'stringValue': customer_id}}]
-            
-            result = self._execute_sql(sql, parameters)
-            
-            if result['success'] and result['data'].get('records'):
-                record = result['data']['records'][0]
-                customer_data = {
-                    'customer_id': record[0]['stringValue'],  # id field
-                    'email': record[1]['stringValue'],
-                    'cognito_user_id': record[2]['stringValue'] if record[2].get('stringValue') else None,
-                    'first_name': record[3]['stringValue'],
-                    'last_name': record[4]['stringValue'],
-                    'phone': record[5]['stringValue'] if record[5].get('stringValue') else None,
-                    'created_at': record[6]['stringValue']
-                }
-                
-                return {
-                    'success': True,
-                    'data': {
-                        'customer': customer_data,
-                        'message': f"Found customer: {customer_data['first_name']} {customer_data['last_name']}"
-                    }
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': f'Customer {customer_id} not found'
-                }
-                
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        customer_data = self._fetch_customer(customer_id)
+        
+        return {
+            'success': True,
+            'data': {
+                'customer': customer_data,
+                'message': f"Found customer: {customer_data['first_name']} {customer_data['last_name']}"
+            }
+        }
     
+    @_wrap_errors()
     def get_tickets_for_customer(self, customer_id: str) -> Dict[str, Any]:
         """Get tickets for customer"""
-        try:
-            sql = """
-            SELECT t.*, c.first_name, c.last_name 
-            FROM tickets t 
-            JOIN customers c ON t.customer_id = c.id 
-            WHERE t.customer_id = :customer_id
-            """
-            parameters = [{'name': 'customer_id', 'value': {'stringValue': customer_id}}]
-            
-            result = self._execute_sql(sql, parameters)
-            
-            if result['success']:
-                tickets = []
-                for record in result['data'].get('records', []):
-                    ticket_data = {
-                        'ticket_id': record[0]['stringValue'],  # id field
-                        'customer_id': record[1]['stringValue'],
-                        'ticket_number': record[2]['stringValue'],
-                        'ticket_type': record[3]['stringValue'],
-                        'original_price': float(record[4]['doubleValue']),
-                        'purchase_date': record[5]['stringValue'],
-                        'event_date': record[6]['stringValue'],
-                        'status': record[7]['stringValue'],
-                        'metadata': record[8]['stringValue'] if record[8].get('stringValue') else '{}',
-                        'created_at': record[9]['stringValue'],
-                        'updated_at': record[10]['stringValue'],
-                        'customer_name': f"{record[11]['stringValue']} {record[12]['stringValue']}"
-                    }
-                    tickets.append(ticket_data)
-                
-                return {
-                    'success': True,
-                    'data': {
-                        'tickets': tickets,
-                        'count': len(tickets),
-                        'message': f"Found {len(tickets)} tickets for customer"
-                    }
-                }
-            else:
-                return result
-                
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        result = self._execute_sql(GET_CUSTOMER_TICKETS_SQL, [_sp('customer_id', customer_id)], as_json=True)
+        
+        tickets = []
+        for ticket_data in _rows(result):
+            ticket_data['original_price'] = float(ticket_data['original_price'])
+            ticket_data['metadata'] = ticket_data['metadata'] or '{}'
+            ticket_data['customer_name'] = f"{ticket_data.pop('first_name')} {ticket_data.pop('last_name')}"
+            tickets.append(ticket_data)
+        
+        return {
+            'success': True,
+            'data': {
+                'tickets': tickets,
+                'count': len(tickets),
+                'message': f"Found {len(tickets)} tickets for customer"
+            }
+        }
+    
+    @staticmethod
+    def _order_parameters(order_id: str, customer_id: str, ticket_id: str, upgrade_tier: str,
+                          travel_date: str, total_amount: float) -> list:
+        """Build the INSERT_UPGRADE_ORDER_SQL parameters for one order"""
+        return [
+            _sp('order_id', order_id),
+            _sp('customer_id', customer_id),
+            _sp('ticket_id', ticket_id),
+            _sp('upgrade_tier', upgrade_tier),
+            _sp('travel_date', travel_date),
+            _sp('total_amount', total_amount, 'doubleValue')
+        ]
     
+    @_wrap_errors()
     def create_upgrade_order(self, customer_id: str, ticket_id: str, upgrade_tier: str, 
                            travel_date: str, total_amount: float) -> Dict[str, Any]:
         """Create upgrade order"""
-        try:
-            order_id = str(uuid.uuid4())
-            
-            sql = """
-            INSERT INTO upgrade_orders (order_id, customer_id, ticket_id, upgrade_tier, 
-                                      travel_date, total_amount, status, created_at)
-            VALUES (:order_id, :customer_id, :ticket_id, :upgrade_tier, 
-                    :travel_date, :total_amount, 'pending', NOW())
-            """
-            
-            parameters = [
-                {'name': 'order_id', 'value': {'stringValue': order_id}},
-                {'name': 'customer_id', 'value': {'stringValue': customer_id}},
-                {'name': 'ticket_id', 'value': {'stringValue': ticket_id}},
-                {'name': 'upgrade_tier', 'value': {'stringValue': upgrade_tier}},
-                {'name': 'travel_date', 'value': {'stringValue': travel_date}},
-                {'name': 'total_amount', 'value': {'doubleValue': total_amount}}
-            ]
-            
-            result = self._execute_sql(sql, parameters)
-            
-            if result['success']:
-                return {
-                    'success': True,
-                    'data': {
-                        'order_id': order_id,
-                        'status': 'pending',
-                        'message': f"Created upgrade order {order_id} for ${total_amount}"
-                    }
-                }
-            else:
-                return result
-                
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        order_id = str(uuid.uuid4())
+        
+        parameters = self._order_parameters(order_id, customer_id, ticket_id, upgrade_tier,
+                                            travel_date, total_amount)
+        
+        self._execute_sql(INSERT_UPGRADE_ORDER_SQL, parameters)
+        self._forget_tickets((ticket_id,))
+        
+        return {
+            'success': True,
+            'data': {
+                'order_id': order_id,
+                'status': 'pending',
+                'message': f"Created upgrade order {order_id} for ${total_amount}"
+            }
+        }
+    
+    @_wrap_errors()
+    def create_upgrade_orders(self, orders: list) -> Dict[str, Any]:
+        """Create several upgrade orders in one batch_execute_statement round-trip
+        
+        Each order is a dict with the create_upgrade_order arguments.
+        """
+        if not orders:
+            return {'success': True, 'data': {'order_ids': [], 'count': 0, 'message': 'No upgrade orders to create'}}
+        
+        order_ids = [str(uuid.uuid4()) for _ in orders]
+        
+        parameter_sets = [
+            self._order_parameters(order_id, order['customer_id'], order['ticket_id'],
+                                   order['upgrade_tier'], order['travel_date'], order['total_amount'])
+            for order_id, order in zip(order_ids, orders)
+        ]
+        
+        self.rds_client.batch_execute_statement(
+            resourceArn=self.db_cluster_arn,
+            secretArn=self.db_secret_arn,
+            database=self.database_name,
+            sql=INSERT_UPGRADE_ORDER_SQL,
+            parameterSets=parameter_sets
+        )
+        self._forget_tickets(order['ticket_id'] for order in orders)
+        
+        return {
+            'success': True,
+            'data': {
+                'order_ids': order_ids,
+                'status': 'pending',
+                'count': len(order_ids),
+                'message': f"Created {len(order_ids)} upgrade orders"
+            }
+        }
     
     # Ticket Agent methods
+    @_wrap_errors('Validation error: ')
     def validate_ticket_eligibility(self, ticket_id: str, upgrade_tier: str) -> Dict[str, Any]:
         """Validate ticket eligibility for upgrade"""
+        # Get ticket details; a missing ticket or a failed query keeps its
+        # own message rather than the 'Validation error: ' prefix
         try:
-            # Get ticket details - use 'id' column which is the primary key
-            sql = "SELECT id, customer_id, ticket_number, ticket_type, original_price, purchase_date, event_date, status FROM tickets WHERE id = :ticket_id::uuid"
-            parameters = [{'name': 'ticket_id', 'value': {'stringValue': ticket_id}}]
-            
-            result = self._execute_sql(sql, parameters)
-            
-            if not result['success']:
-                return {'success': False, 'error': f'Database error: {result["error"]}'}
-            
-            if not result['data'].get('records'):
-                return {'success': False, 'error': f'Ticket {ticket_id} not found'}
-            
-            record = result['data']['records'][0]
-            # Map database columns correctly based on SELECT order
-            ticket_type = record[3]['stringValue']  # ticket_type column (4th in SELECT)
-            status = record[7]['stringValue']  # status column (8th in SELECT)
-            
-            # Business logic for eligibility
-            if status != 'active':
-                return {
-                    'success': True,
-                    'data': {
-                        'eligible': False,
-                        'reason': f'Ticket status is {status}, must be active for upgrades',
-                        'current_tier': ticket_type
-                    }
-                }
-            
-            # For demo purposes, always allow upgrades for active tickets
+            ticket = self._fetch_ticket(ticket_id)
+        except LookupError as e:
+            return {'success': False, 'error': str(e)}
+        except Exception as e:
+            return {'success': False, 'error': f'Database error: {e}'}
+        ticket_type = ticket['ticket_type']
+        status = ticket['status']
+        
+        # Business logic for eligibility
+        if status != 'active':
             return {
                 'success': True,
                 'data': {
-                    'eligible': True,
-                    'reason': f'Ticket eligible for upgrade from {ticket_type} to {upgrade_tier}',
-                    'current_tier': ticket_type,
-                    'upgrade_tier': upgrade_tier,
-                    'ticket_id': ticket_id
+                    'eligible': False,
+                    'reason': f'Ticket status is {status}, must be active for upgrades',
+                    'current_tier': ticket_type
                 }
             }
-            
-        except Exception as e:
-            return {'success': False, 'error': f'Validation error: {str(e)}'}
+        
+        # For demo purposes, always allow upgrades for active tickets
+        return {
+            'success': True,
+            'data': {
+                'eligible': True,
+                'reason': f'Ticket eligible for upgrade from {ticket_type} to {upgrade_tier}',
+                'current_tier': ticket_type,
+                'upgrade_tier': upgrade_tier,
+                'ticket_id': ticket_id
+            }
+        }
     
+    @_wrap_errors()
     def calculate_upgrade_pricing(self, ticket_id: str, upgrade_tier: str, travel_date: str) -> Dict[str, Any]:
         """Calculate upgrade pricing"""
-        try:
-            # Get ticket details
-            sql = "SELECT * FROM tickets WHERE ticket_id = :ticket_id"
-            parameters = [{'name': 'ticket_id', 'value': {'stringValue': ticket_id}}]
-            
-            result = self._execute_sql(sql, parameters)
-            
-            if not result['success'] or not result['data'].get('records'):
-                return {'success': False, 'error': f'Ticket {ticket_id} not found'}
-            
-            record = result['data']['records'][0]
-            original_price = float(record[7]['doubleValue'])  # original_price column
-            current_tier = record[8]['stringValue']  # current_tier column
-            
-            # Pricing logic
-            base_prices = {
-                'Standard': 50.0,
-                'Non-stop': 150.0,
-                'Double Fun': 300.0
-            }
-            
-            # Seasonal multipliers
-            event_date = datetime.strptime(travel_date, '%Y-%m-%d')
-            is_weekend = event_date.weekday() >= 5
-            is_holiday_season = event_date.month in [11, 12, 1]  # Nov, Dec, Jan
-            
-            multiplier = 1.0
-            if is_weekend:
-                multiplier += 0.2
-            if is_holiday_season:
-                multiplier += 0.3
-            
-            base_upgrade_price = base_prices.get(upgrade_tier, 100.0)
-            final_price = base_upgrade_price * multiplier
-            
-            # LLM reasoning for pricing explanation
-            llm_prompt = f"""
-            Explain the pricing for upgrading a ticket from {current_tier} to {upgrade_tier} 
-            on {travel_date}. The base price is ${base_upgrade_price:.2f} and the final price 
-            is ${final_price:.2f} with multiplier {multiplier:.2f}.
-            Weekend: {is_weekend}, Holiday season: {is_holiday_season}.
-            Provide a brief, customer-friendly explanation.
-            """
+        # Get ticket details
+        current_tier = self._fetch_ticket(ticket_id)['ticket_type']
+        
+        # Seasonal multipliers
+        event_date = date.fromisoformat(travel_date)
+        is_weekend = event_date.weekday() >= 5
+        is_holiday_season = event_date.month in [11, 12, 1]  # Nov, Dec, Jan
+        
+        key = (is_weekend << 1) | is_holiday_season
+        multiplier = _MULT[key]
+        
+        base_upgrade_price = BASE_PRICES.get(upgrade_tier, 100.0)
+        final_price = UPGRADE_PRICES.get((upgrade_tier, key), base_upgrade_price * multiplier)
+        
+        # LLM reasoning for pricing explanation; the travel date only
+        # matters through the weekend/holiday flags, so it stays out of
+        # the prompt and explanations can be reused across dates
+        cache_key = (current_tier, upgrade_tier, is_weekend, is_holiday_season,
+                     round(base_upgrade_price, 2), round(final_price, 2))
+        explanation = _pricing_explanations.get(cache_key)
+        
+        if explanation is None:
+            llm_prompt = PRICING_PROMPT.format(
+                current_tier=current_tier, upgrade_tier=upgrade_tier,
+                base_price=base_upgrade_price, final_price=final_price, multiplier=multiplier,
+                is_weekend=is_weekend, is_holiday_season=is_holiday_season
+            )
             
-            explanation = self._call_llm(llm_prompt)
+            explanation = self._call_llm(llm_prompt, max_tokens=150)
             
-            return {
-                'success': True,
-                'data': {
-                    'ticket_id': ticket_id,
-                    'current_tier': current_tier,
-                    'upgrade_tier': upgrade_tier,
-                    'base_price': base_upgrade_price,
-                    'multiplier': multiplier,
-                    'final_price': round(final_price, 2),
-                    'travel_date': travel_date,
-                    'explanation': explanation,
-                    'pricing_factors': {
-                        'weekend_premium': is_weekend,
-                        'holiday_premium': is_holiday_season
-                    }
+            # Failed calls return an error string; don't keep those
+            if not explanation.startswith('LLM Error:'):
+                _pricing_explanations[cache_key] = explanation
+                if len(_pricing_explanations) > PRICING_EXPLANATION_CACHE_SIZE:
+                    _pricing_explanations.popitem(last=False)
+        else:
+            _pricing_explanations.move_to_end(cache_key)
+        
+        return {
+            'success': True,
+            'data': {
+                'ticket_id': ticket_id,
+                'current_tier': current_tier,
+                'upgrade_tier': upgrade_tier,
+                'base_price': base_upgrade_price,
+                'multiplier': multiplier,
+                'final_price': round(final_price, 2),
+                'travel_date': travel_date,
+                'explanation': explanation,
+                'pricing_factors': {
+                    'weekend_premium': is_weekend,
+                    'holiday_premium': is_holiday_season
                 }
             }
-            
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        }
     
+    @_wrap_errors()
     def get_upgrade_recommendations(self, customer_id: str, ticket_id: str) -> Dict[str, Any]:
         """Get upgrade recommendations"""
-        try:
-            # Get customer and ticket details
-            customer_result = self.get_customer(customer_id)
-            if not customer_result['success']:
-                return customer_result
-            
-            sql = "SELECT * FROM tickets WHERE ticket_id = :ticket_id"
-            parameters = [{'name': 'ticket_id', 'value': {'stringValue': ticket_id}}]
-            
-            ticket_result = self._execute_sql(sql, parameters)
-            
-            if not ticket_result['success'] or not ticket_result['data'].get('records'):
-                return {'success': False, 'error': f'Ticket {ticket_id} not found'}
-            
-            record = ticket_result['data']['records'][0]
-            current_tier = record[8]['stringValue']
-            event_name = record[2]['stringValue']
-            event_date = record[3]['stringValue']
-            
-            customer_data = customer_result['data']['customer']
-            customer_tier = customer_data['tier']
-            
-            # LLM-powered recommendations
-            llm_prompt = f"""
-            Provide upgrade recommendations for a {customer_tier} tier customer named {customer_data['name']} 
-            who has a {current_tier} ticket for {event_name} on {event_date}.
-            
-            Available upgrade tiers: Standard, Non-stop, Double Fun
-            Current tier: {current_tier}
-            
-            Consider the customer's tier status and provide personalized recommendations with reasons.
-            Format as a JSON-like structure with recommendations.
-            """
-            
-            recommendations_text = self._call_llm(llm_prompt)
-            
-            # Generate structured recommendations
-            available_tiers = []
-            tier_hierarchy = ['Standard', 'Non-stop', 'Double Fun']
-            current_index = tier_hierarchy.index(current_tier) if current_tier in tier_hierarchy else -1
-            
-            for i, tier in enumerate(tier_hierarchy):
-                if i > current_index:
-                    available_tiers.append({
-                        'tier': tier,
-                        'recommended': i == current_index + 1,  # Recommend next tier up
-                        'description': f'Upgrade to {tier} tier'
-                    })
-            
-            return {
-                'success': True,
-                'data': {
-                    'customer_id': customer_id,
-                    'ticket_id': ticket_id,
-                    'current_tier': current_tier,
-                    'customer_tier': customer_tier,
-                    'available_upgrades': available_tiers,
-                    'ai_recommendations': recommendations_text,
-                    'event_info': {
-                        'name': event_name,
-                        'date': event_date
-                    }
+        # Get customer and ticket details; the two queries are independent,
+        # so the ticket lookup runs in the background alongside the customer's
+        ticket_future = _db_executor.submit(self._fetch_ticket, ticket_id)
+        customer_data = self._fetch_customer(customer_id)
+        ticket = ticket_future.result()
+        
+        current_tier = ticket['ticket_type']
+        event_name = ticket['ticket_number']
+        event_date = ticket['event_date']
+        
+        # The customers table has no tier or full name column
+        customer_tier = customer_data.get('tier', 'standard')
+        customer_name = f"{customer_data['first_name']} {customer_data['last_name']}"
+        
+        # LLM-powered recommendations
+        llm_prompt = RECOMMENDATIONS_PROMPT.format(
+            customer_tier=customer_tier, customer_name=customer_name,
+            current_tier=current_tier, event_name=event_name, event_date=event_date
+        )
+        
+        # Start the LLM call now and build the structured part while it runs
+        recommendations_future = self._submit_llm(llm_prompt, max_tokens=400)
+        
+        # Generate structured recommendations
+        available_tiers = []
+        current_index = TIER_INDEX.get(current_tier, -1)
+        
+        for i, tier in enumerate(TIER_ORDER):
+            if i > current_index:
+                available_tiers.append({
+                    'tier': tier,
+                    'recommended': i == current_index + 1,  # Recommend next tier up
+                    'description': f'Upgrade to {tier} tier'
+                })
+        
+        recommendations_text = recommendations_future.result()
+        
+        return {
+            'success': True,
+            'data': {
+                'customer_id': customer_id,
+                'ticket_id': ticket_id,
+                'current_tier': current_tier,
+                'customer_tier': customer_tier,
+                'available_upgrades': available_tiers,
+                'ai_recommendations': recommendations_text,
+                'event_info': {
+                    'name': event_name,
+                    'date': event_date
                 }
             }
-            
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        }
     
+    @_wrap_errors()
     def get_available_upgrade_tiers(self, ticket_id: str) -> Dict[str, Any]:
         """Get available upgrade tiers"""
-        try:
-            # Get ticket details
-            sql = "SELECT current_tier, status FROM tickets WHERE ticket_id = :ticket_id"
-            parameters = [{'name': 'ticket_id', 'value': {'stringValue': ticket_id}}]
-            
-            result = self._execute_sql(sql, parameters)
-            
-            if not result['success'] or not result['data'].get('records'):
-                return {'success': False, 'error': f'Ticket {ticket_id} not found'}
-            
-            record = result['data']['records'][0]
-            current_tier = record[0]['stringValue']
-            status = record[1]['stringValue']
-            
-            if status != 'active':
-                return {
-                    'success': True,
-                    'data': {
-                        'available_tiers': [],
-                        'message': f'No upgrades available - ticket status is {status}'
-                    }
-                }
-            
-            # Define tier hierarchy and pricing
-            tier_info = {
-                'Standard': {'price_range': '$50-70', 'features': ['Priority boarding', 'Extra legroom']},
-                'Non-stop': {'price_range': '$150-200', 'features': ['Premium seating', 'Complimentary drinks', 'Fast track entry']},
-                'Double Fun': {'price_range': '$300-400', 'features': ['VIP experience', 'Meet & greet', 'Exclusive merchandise']}
-            }
-            
-            tier_hierarchy = ['Standard', 'Non-stop', 'Double Fun']
-            current_index = tier_hierarchy.index(current_tier) if current_tier in tier_hierarchy else -1
-            
-            available_tiers = []
-            for i, tier in enumerate(tier_hierarchy):
-                if i > current_index:
-                    tier_data = tier_info[tier].copy()
-                    tier_data['tier'] = tier
-                    tier_data['available'] = True
-                    available_tiers.append(tier_data)
-            
+        # Get ticket details
+        ticket = self._fetch_ticket(ticket_id)
+        return self._tiers_from_state(ticket['ticket_type'], ticket['status'], ticket_id)
+    
+    def _tiers_from_state(self, current_tier: str, status: str, ticket_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get available upgrade tiers for a ticket whose tier and status are already known
+        
+        Returns the same result as get_available_upgrade_tiers without a database query.
+        """
+        if status != 'active':
             return {
                 'success': True,
                 'data': {
-                    'ticket_id': ticket_id,
-                    'current_tier': current_tier,
-                    'available_tiers': available_tiers,
-                    'total_available': len(available_tiers)
+                    'available_tiers': [],
+                    'message': f'No upgrades available - ticket status is {status}'
                 }
             }
-            
-        except Exception as e:
-            return {'success': False, 'error': str(e)}
+        
+        current_index = TIER_INDEX.get(current_tier, -1)
+        
+        available_tiers = []
+        for i, tier in enumerate(TIER_ORDER):
+            if i > current_index:
+                tier_data = TIER_INFO[tier].copy()
+                tier_data['tier'] = tier
+                tier_data['available'] = True
+                available_tiers.append(tier_data)
+        
+        return {
+            'success': True,
+            'data': {
+                'ticket_id': ticket_id,
+                'current_tier': current_tier,
+                'available_tiers': available_tiers,
+                'total_available': len(available_tiers)
+            }
+        }
+    
+    @_wrap_errors()
+    def upgrade_quote(self, ticket_id: str, upgrade_tier: str, travel_date: str) -> Dict[str, Any]:
+        """Get eligibility, pricing and available tiers for a ticket in one call
+        
+        The ticket is fetched once up front; eligibility and pricing reuse it
+        through the ticket cache and the tiers are derived from it directly.
+        Pricing, and with it the LLM explanation, is skipped for tickets that
+        are not eligible for the upgrade.
+        """
+        ticket = self._fetch_ticket(ticket_id)
+        
+        eligibility = self.validate_ticket_eligibility(ticket_id, upgrade_tier)
+        if not eligibility['success']:
+            return eligibility
+        
+        pricing = None
+        if eligibility['data']['eligible']:
+            pricing = self.calculate_upgrade_pricing(ticket_id, upgrade_tier, travel_date)
+            if not pricing['success']:
+                return pricing
+        
+        tiers = self._tiers_from_state(ticket['ticket_type'], ticket['status'], ticket_id)
+        
+        return {
+            'success': True,
+            'data': {
+                'ticket_id': ticket_id,
+                'eligibility': eligibility['data'],
+                'pricing': pricing['data'] if pricing else None,
+                'available_tiers': tiers['data']
+            }
+        }
 
 
 def create_client():
-    """Create and return a DirectAgentClient instance"""
-    return DirectAgentClient()
\ No newline at end of file
+    """Return the shared DirectAgentClient instance, creating it on first use"""
+    global _instance
+    if _instance is None:
+        _instance = DirectAgentClient()
+    return _instance
@@ -8,6 +8,7 @@ Handles ticket-related operations by orchestrating calls to AgentCore agents.
 import json
 import asyncio
 import os
+import re
 import threading
 from typing import Dict, Any
 from agentcore_client import create_client
@@ -17,30 +18,150 @@ from auth_handler import verify_token
 import boto3
 import urllib3
 
+# orjson encodes response payloads several times faster than the standard
+# library; fall back to json where it isn't packaged
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_dumps = json.dumps
 
-def run_async_in_thread(coro):
-    """Run async function in a separate thread to avoid event loop conflicts"""
-    result = {}
-    exception = {}
+# Chat intent keywords: intent -> words and phrases, matched anywhere in the message
+INTENT_KEYWORDS = {
+    # Intents driving the AgentCore tool calls
+    'validate': ('validate', 'eligible', 'can i upgrade'),
+    'my_ticket': ('my ticket',),
+    'pricing': ('price', 'cost', 'how much', 'pricing'),
+    'recommend': ('recommend', 'suggest', 'best', 'which upgrade'),
+    'compare': ('compare', 'tiers', 'options', 'what are', 'show me'),
+    'select': ('proceed with', "i'd like the", 'select', 'choose'),
+    'tier_name': ('standard', 'premium', 'vip'),
+    'want_to': ('want to',),
+    'tier_package': ('standard upgrade', 'premium experience', 'vip package'),
     
-    def run_in_thread():
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result['value'] = loop.run_until_complete(coro)
-        except Exception as e:
-            exception['error'] = e
-        finally:
-            loop.close()
+    # Intents for the pattern-matched fallback responses
+    'greeting': ('hello', 'hi', 'hey', 'good morning', 'good afternoon'),
+    'upgrade': ('upgrade', 'better', 'premium', 'vip', 'enhance'),
+    'ticket': ('ticket', 'booking', 'reservation', 'my ticket'),
+    'cost': ('price', 'cost', 'how much', 'money', 'expensive', 'cheap'),
+    'features': ('features', 'benefits', 'what do i get', 'includes', 'perks'),
+    'help': ('help', 'what can you do', 'assist', 'support'),
+    'positive': ('yes', 'sure', 'okay', 'sounds good', 'interested', 'tell me more'),
+    'negative': ('no', 'not interested', 'maybe later', 'not now'),
+    'tiers': ('standard', 'non-stop', 'double fun', 'vip'),
+}
+
+
+def _build_keyword_matcher(intent_keywords: dict):
+    """Compile the intent keywords into one regex plus a keyword -> intents map
+    
+    The regex looks ahead at every position and captures the longest keyword
+    starting there. Each keyword's intents also include those of the keywords
+    it contains, e.g. "vip package" implies "vip", so matches hidden by a
+    longer one aren't lost.
+    """
+    keyword_intents = {}
+    for intent, keywords in intent_keywords.items():
+        for keyword in keywords:
+            keyword_intents.setdefault(keyword, set()).add(intent)
+    
+    implied = {
+        keyword: frozenset().union(*(
+            intents for other, intents in keyword_intents.items() if other in keyword
+        ))
+        for keyword in keyword_intents
+    }
+    
+    alternatives = '|'.join(map(re.escape, sorted(keyword_intents, key=len, reverse=True)))
+    return re.compile(f"(?=({alternatives}))"), implied
+
+
+_KEYWORD_PATTERN, _KEYWORD_INTENTS = _build_keyword_matcher(INTENT_KEYWORDS)
+
+
+def detect_intents(message_lower: str) -> set:
+    """Return the set of chat intents found in a lowercased message
+    
+    A single scan of the message finds every keyword at once.
+    """
+    intents = set()
+    for match in _KEYWORD_PATTERN.finditer(message_lower):
+        intents |= _KEYWORD_INTENTS[match.group(1)]
+    
+    # Choosing a specific tier, e.g. "proceed with premium" or "I want to get the VIP package"
+    if ('select' in intents and 'tier_name' in intents) or ('want_to' in intents and 'tier_package' in intents):
+        intents.add('upgrade_selection')
+    
+    return intents
+
+
+# CORS headers shared by every response
+CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
+}
+
+
+def _response(status_code: int, body: str) -> Dict[str, Any]:
+    """Build an API Gateway response around an already serialized body"""
+    return {
+        'statusCode': status_code,
+        'headers': CORS_HEADERS,
+        'body': body
+    }
+
+
+def _ok(result: Any) -> Dict[str, Any]:
+    """200 response with a JSON-encoded result"""
+    return _response(200, _json_dumps(result))
+
+
+def _err(status_code: int, message: str) -> Dict[str, Any]:
+    """Error response with a JSON {'error': message} body"""
+    return _response(status_code, json.dumps({'error': message}))
+
+
+# Responses that never change, built once per container
+_CORS_PREFLIGHT = _response(200, json.dumps({'message': 'CORS preflight'}))
+_ERR_MISSING_AUTH = _err(401, 'Missing or invalid authorization header')
+_ERR_INVALID_TOKEN = _err(401, 'Invalid token')
+_ERR_MESSAGE_REQUIRED = _err(400, 'Message is required')
+_ERR_CUSTOMER_ID_REQUIRED = _err(400, 'Customer ID is required')
+_ERR_TICKET_ID_REQUIRED = _err(400, 'Ticket ID is required')
+_ERR_TICKET_AND_CUSTOMER_ID_REQUIRED = _err(400, 'Ticket ID and Customer ID are required')
+_ERR_NOT_FOUND = _err(404, 'Endpoint not found')
+_ERR_INTERNAL = _err(500, 'Internal server error')
+
+
+# Event loop shared by all invocations, running in a daemon thread
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop():
+    """Return the background event loop, starting it on first use"""
+    global _loop
     
-    thread = threading.Thread(target=run_in_thread)
-    thread.start()
-    thread.join()
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='ticket-handler-loop', daemon=True).start()
+            _loop = loop
     
-    if 'error' in exception:
-        raise exception['error']
+    return _loop
+
+
+def run_async_in_thread(coro):
+    """Run async function on the background event loop to avoid event loop conflicts
     
-    return result['value']
+    The loop and its thread persist across warm invocations, so each request
+    only pays for scheduling the coroutine.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -55,40 +176,20 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     - GET /tickets/{ticket_id}/tiers - Get tier comparison
     """
     
-    # CORS headers
-    headers = {
-        'Content-Type': 'application/json',
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
-    }
-    
     try:
         # Handle preflight OPTIONS request
         if event.get('httpMethod') == 'OPTIONS':
-            return {
-                'statusCode': 200,
-                'headers': headers,
-                'body': json.dumps({'message': 'CORS preflight'})
-            }
+            return _CORS_PREFLIGHT
         
         # Verify authentication
         auth_header = event.get('headers', {}).get('Authorization')
         if not auth_header or not auth_header.startswith('Bearer '):
-            return {
-                'statusCode': 401,
-                'headers': headers,
-                'body': json.dumps({'error': 'Missing or invalid authorization header'})
-            }
+            return _ERR_MISSING_AUTH
         
         token = auth_header.replace('Bearer ', '')
         auth_result = verify_token(token)
         if not auth_result['success']:
-            return {
-                'statusCode': 401,
-                'headers': headers,
-                'body': json.dumps({'error': 'Invalid token'})
-            }
+            return _ERR_INVALID_TOKEN
         
         # Parse request
         http_method = event.get('httpMethod')
@@ -106,24 +207,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
     except Exception as e:
         print(f"Ticket handler error: {e}")
-        return {
-            'statusCode': 500,
-            'headers': headers,
-            'body': json.dumps({'error': 'Internal server error'})
-        }
+        return _ERR_INTERNAL
 
 
 async def route_request(method: str, path: str, path_params: Dict[str, Any], 
                        query_params: Dict[str, Any], body: Dict[str, Any]) -> Dict[str, Any]:
     """Route request to appropriate handler"""
     
-    headers = {
-        'Content-Type': 'application/json',
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
-    }
-    
     try:
         # Create AgentCore client
         client = create_client()
@@ -136,35 +226,19 @@ async def route_request(method: str, path: str, path_params: Dict[str, Any],
             chat_context = body.get('context', {})
             
             if not message:
-                return {
-                    'statusCode': 400,
-                    'headers': headers,
-                    'body': json.dumps({'error': 'Message is required'})
-                }
+                return _ERR_MESSAGE_REQUIRED
             
             result = await handle_chat_request(client, message, conversation_history, chat_context)
-            return {
-                'statusCode': 200,
-                'headers': headers,
-                'body': json.dumps(result)
-            }
+            return _ok(result)
         
         elif method == 'GET' and '/tickets/' in path and path.endswith('/tickets'):
             # GET /tickets/{customer_id}
             customer_id = path_params.get('customer_id')
             if not customer_id:
-                return {
-                    'statusCode': 400,
-                    'headers': headers,
-                    'body': json.dumps({'error': 'Customer ID is required'})
-                }
+                return _ERR_CUSTOMER_ID_REQUIRED
             
             result = await client.get_tickets_for_customer(customer_id)
-            return {
-                'statusCode': 200,
-                'headers': headers,
-                'body': json.dumps(result)
-            }
+            return _ok(result)
         
         elif method == 'POST' and '/validate' in path:
             # POST /tickets/{ticket_id}/validate
@@ -172,18 +246,10 @@ async def route_request(method: str, path: str, path_params: Dict[str, Any],
             upgrade_tier = body.get('upgrade_tier', 'Standard')
             
             if not ticket_id:
-                return {
-                    'statusCode': 400,
-                    'headers': headers,
-                    'body': json.dumps({'error': 'Ticket ID is required'})
-                }
+                return _ERR_TICKET_ID_REQUIRED
             
             result = await client.validate_ticket_eligibility(ticket_id, upgrade_tier)
-            return {
-                'statusCode': 200,
-                'headers': headers,
-                'body': json.dumps(result)
-            }
+            return _ok(result)
         
         elif method == 'POST' and '/pricing' in path:
             # POST /tickets/{ticket_id}/pricing
@@ -192,18 +258,10 @@ async def route_request(method: str, path: str, path_params: Dict[str, Any],
             event_date = body.get('event_date', '2026-02-15')
             
             if not ticket_id:
-                return {
-                    'statusCode': 400,
-                    'headers': headers,
-                    'body': json.dumps({'error': 'Ticket ID is required'})
-                }
+                return _ERR_TICKET_ID_REQUIRED
             
             result = await client.calculate_upgrade_pricing(ticket_id, upgrade_tier, event_date)
-            return {
-                'statusCode': 200,
-                'headers': headers,
-                'body': json.dumps(result)
-            }
+            return _ok(result)
         
         elif method == 'GET' and '/recommendations' in path:
             # GET /tickets/{ticket_id}/recommendations
@@ -211,51 +269,27 @@ async def route_request(method: str, path: str, path_params: Dict[str, Any],
             customer_id = query_params.get('customer_id')
             
             if not ticket_id or not customer_id:
-                return {
-                    'statusCode': 400,
-                    'headers': headers,
-                    'body': json.dumps({'error': 'Ticket ID and Customer ID are required'})
-                }
+                return _ERR_TICKET_AND_CUSTOMER_ID_REQUIRED
             
             result = await client.get_upgrade_recommendations(customer_id, ticket_id)
-            return {
-                'statusCode': 200,
-                'headers': headers,
-                'body': json.dumps(result)
-            }
+            return _ok(result)
         
         elif method == 'GET' and '/tiers' in path:
             # GET /tickets/{ticket_id}/tiers
             ticket_id = path_params.get('ticket_id')
             
             if not ticket_id:
-                return {
-                    'statusCode': 400,
-                    'headers': headers,
-                    'body': json.dumps({'error': 'Ticket ID is required'})
-                }
+                return _ERR_TICKET_ID_REQUIRED
             
             result = await client.get_upgrade_tier_comparison(ticket_id)
-            return {
-                'statusCode': 200,
-                'headers': headers,
-                'body': json.dumps(result)
-            }
+            return _ok(result)
         
         else:
-            return {
-                'statusCode': 404,
-                'headers': headers,
-                'body': json.dumps({'error': 'Endpoint not found'})
-            }
+            return _ERR_NOT_FOUND
             
     except Exception as e:
         print(f"Route handler error: {e}")
-        return {
-            'statusCode': 500,
-            'headers': headers,
-            'body': json.dumps({'error': 'Internal server error'})
-        }
+        return _ERR_INTERNAL
 
 
 async def handle_chat_request(client, message: str, conversation_history: list, chat_context: dict) -> dict:
@@ -286,6 +320,7 @@ async def generate_ai_response_with_agentcore(client, message: str, conversation
         # to generate intelligent responses based on message content
         
         message_lower = message.lower()
+        intents = detect_intents(message_lower)
         
         # Check if user is asking about a specific ticket
         ticket_id = chat_context.get('ticketId', '550e8400-e29b-41d4-a716-446655440002')
@@ -308,7 +343,7 @@ async def generate_ai_response_with_agentcore(client, message: str, conversation
                 }
         
         # Use working MCP tools based on message intent
-        if any(word in message_lower for word in ['validate', 'eligible', 'can i upgrade']) or (any(word in message_lower for word in ['my ticket']) and chat_context.get('hasTicketInfo')):
+        if 'validate' in intents or ('my_ticket' in intents and chat_context.get('hasTicketInfo')):
             # Use ticket validation tool (we know this works with 10,000+ char responses)
             result = await client.validate_ticket_eligibility(ticket_id, 'standard')
             
@@ -317,9 +352,10 @@ async def generate_ai_response_with_agentcore(client, message: str, conversation
                 mcp_data = result.get('data', {})
                 
                 # Check if we have structured content (real LLM response)
-                if 'content' in mcp_data and len(str(mcp_data['content'])) > 1000:
+                content = mcp_data.get('content')
+                if content is not None and content_length(content) > 1000:
                     # Extract the LLM-generated content
-                    llm_content = str(mcp_data['content'])
+                    llm_content = content if isinstance(content, str) else str(content)
                     
                     # Use the real LLM response but make it conversational
                     ai_response = f"I've analyzed your ticket using our advanced system. {llm_content[:500]}... "
@@ -361,7 +397,7 @@ async def generate_ai_response_with_agentcore(client, message: str, conversation
                         "upgrade_options": []
                     }
         
-        elif any(word in message_lower for word in ['price', 'cost', 'how much', 'pricing']):
+        elif 'pricing' in intents:
             # Use pricing calculation tool (we know this works)
             result = await client.calculate_upgrade_pricing('standard', 'standard', 75.0)
             
@@ -370,9 +406,10 @@ async def generate_ai_response_with_agentcore(client, message: str, conversation
                 mcp_data = result.get('data', {})
                 
                 # Check if we have structured content (real LLM response)
-                if 'content' in mcp_data and len(str(mcp_data['content'])) > 200:
+                content = mcp_data.get('content')
+                if content is not None and content_length(content) > 200:
                     # Extract the LLM-generated content
-                    llm_content = str(mcp_data['content'])
+                    llm_content = content if isinstance(content, str) else str(content)
                     
                     # Use the real LLM response but make it conversational
                     ai_response = f"Here's the detailed pricing analysis from our system: {llm_content[:400]}... "
@@ -400,7 +437,7 @@ async def generate_ai_response_with_agentcore(client, message: str, conversation
                     "upgrade_options": get_upgrade_options()
                 }
         
-        elif any(word in message_lower for word in ['recommend', 'suggest', 'best', 'which upgrade']):
+        elif 'recommend' in intents:
             # Use recommendations tool (we know this works)
             result = await client.get_upgrade_recommendations('sample-customer-id', ticket_id)
             
@@ -421,7 +458,7 @@ async def generate_ai_response_with_agentcore(client, message: str, conversation
                     "upgrade_options": get_upgrade_options()
                 }
         
-        elif any(word in message_lower for word in ['compare', 'tiers', 'options', 'what are', 'show me']):
+        elif 'compare' in intents:
             # Use tier comparison tool (we know this works)
             result = await client.get_upgrade_tier_comparison(ticket_id)
             
@@ -440,7 +477,7 @@ async def generate_ai_response_with_agentcore(client, message: str, conversation
                     "upgrade_options": get_upgrade_options()
                 }
         
-        elif any(word in message_lower for word in ['proceed with', 'i\'d like the', 'select', 'choose']) and any(tier in message_lower for tier in ['standard', 'premium', 'vip']) or (any(word in message_lower for word in ['want to']) and any(tier in message_lower for tier in ['standard upgrade', 'premium experience', 'vip package'])):
+        elif 'upgrade_selection' in intents:
             # Handle upgrade selection - user has chosen a specific upgrade
             selected_upgrade = chat_context.get('selectedUpgrade', {})
             
@@ -469,9 +506,10 @@ async def generate_ai_response_with_agentcore(client, message: str, conversation
                 mcp_data = result.get('data', {})
                 
                 # Check if we have structured content (real LLM response)
-                if 'content' in mcp_data and len(str(mcp_data['content'])) > 200:
+                content = mcp_data.get('content')
+                if content is not None and content_length(content) > 200:
                     # Extract the LLM-generated content and customize for upgrade selection
-                    llm_content = str(mcp_data['content'])
+                    llm_content = content if isinstance(content, str) else str(content)
                     
                     ai_response = f"Perfect choice! You've selected the {upgrade_name} for ${upgrade_price}. "
                     ai_response += f"Let me process this upgrade for you. {llm_content[:300]}... "
@@ -507,6 +545,22 @@ async def generate_ai_response_with_agentcore(client, message: str, conversation
         return generate_intelligent_response(message, conversation_history, chat_context)
 
 
+def content_length(content: Any) -> int:
+    """Text length of MCP tool content, without stringifying large structures
+    
+    Strings are measured directly; content block lists by the length of
+    their text, anything else by its string form.
+    """
+    if isinstance(content, str):
+        return len(content)
+    if isinstance(content, list):
+        return sum(
+            len(block.get('text', '')) if isinstance(block, dict) else len(str(block))
+            for block in content
+        )
+    return len(str(content))
+
+
 # Removed old call_agent_http, get_bearer_token, and extract_response_text functions
 # Now using AgentCore client properly
 
@@ -514,6 +568,7 @@ async def generate_ai_response_with_agentcore(client, message: str, conversation
 def generate_intelligent_response(message: str, conversation_history: list, chat_context: dict) -> dict:
     """Generate intelligent AI responses based on message analysis"""
     message_lower = message.lower()
+    intents = detect_intents(message_lower)
     
     # SECURITY FIX: Check for invalid ticket IDs first
     ticket_id = chat_context.get('ticketId')
@@ -533,145 +588,179 @@ def generate_intelligent_response(message: str, conversation_history: list, chat
                 "upgrade_options": []
             }
     
-    # Greeting responses
-    if any(word in message_lower for word in ['hello', 'hi', 'hey', 'good morning', 'good afternoon']):
-        return {
-            "response": "Hello! I'm your AI ticket assistant. I'm here to help you explore upgrade options, check pricing, and enhance your ticket experience. What can I help you with today?",
-            "show_upgrade_buttons": False,
-            "upgrade_options": []
-        }
-    
-    # Upgrade selection (when user has chosen a specific upgrade)
-    if any(word in message_lower for word in ['proceed with', 'i\'d like the', 'select', 'choose']) and any(tier in message_lower for tier in ['standard', 'premium', 'vip']) or (any(word in message_lower for word in ['want to']) and any(tier in message_lower for tier in ['standard upgrade', 'premium experience', 'vip package'])):
-        # Extract upgrade details from message
-        upgrade_name = "upgrade"
-        upgrade_price = 0
-        
-        if 'standard' in message_lower:
-            upgrade_name = "Standard Upgrade"
-            upgrade_price = 50
-        elif 'premium' in message_lower:
-            upgrade_name = "Premium Experience"
-            upgrade_price = 150
-        elif 'vip' in message_lower:
-            upgrade_name = "VIP Package"
-            upgrade_price = 300
-        
-        return {
-            "response": f"Perfect! You've selected the {upgrade_name} for ${upgrade_price}. This is an excellent choice that will significantly enhance your experience. I'm processing your upgrade now, which includes all the premium features and benefits. Your ticket is being updated, and you'll receive a confirmation email shortly with all the details of your {upgrade_name}. Thank you for upgrading! Is there anything else I can help you with?",
-            "show_upgrade_buttons": False,
-            "upgrade_options": []
-        }
-    
-    # Upgrade intent - primary use case (but require ticket validation first)
-    if any(word in message_lower for word in ['upgrade', 'better', 'premium', 'vip', 'enhance']):
-        # Check if we have ticket information in context
-        if chat_context.get('hasTicketInfo') and chat_context.get('ticketId'):
-            return {
-                "response": "Great! I'd be happy to help you explore upgrade options. We have several tiers available that can significantly enhance your experience. Each upgrade includes additional perks and benefits. Would you like me to show you what's available?",
-                "show_upgrade_buttons": True,
-                "upgrade_options": get_upgrade_options()
-            }
-        else:
-            return {
-                "response": "I'd be happy to help you explore upgrade options! To provide you with the most accurate pricing and availability, I'll need your ticket information first. Could you please share your ticket ID? It should be in the format like '550e8400-e29b-41d4-a716-446655440002'.",
-                "show_upgrade_buttons": False,
-                "upgrade_options": []
-            }
+    # Respond to the first matching intent, in INTENT_RESPONDERS order
+    for intent, responder in INTENT_RESPONDERS.items():
+        if intent in intents:
+            return responder(message_lower, chat_context)
     
-    # Ticket inquiry
-    if any(word in message_lower for word in ['ticket', 'booking', 'reservation', 'my ticket']):
-        if '550e8400' in message_lower or 'show' in message_lower:
-            return {
-                "response": "I can see your ticket (550e8400-e29b-41d4-a716-446655440002). It's a Standard ticket for $75.00 with an upcoming event. This is a great ticket, and there are several upgrade options available that could enhance your experience. Would you like to see what upgrades are available?",
-                "show_upgrade_buttons": True,
-                "upgrade_options": get_upgrade_options()
-            }
-        else:
-            return {
-                "response": "I can help you with your ticket information! To provide specific details, could you share your ticket ID? Or if you'd like to explore upgrade options right away, I can show you what's available to enhance your experience.",
-                "show_upgrade_buttons": False,
-                "upgrade_options": []
-            }
+    # Default intelligent response
+    return {
+        "response": "I understand you're interested in ticket services. I'm here to help you explore upgrade options that can enhance your experience. Whether you're looking for better seating, exclusive perks, or VIP treatment, I can show you what's available. What specific aspect of upgrading interests you most?",
+        "show_upgrade_buttons": False,
+        "upgrade_options": []
+    }
+
+
+def _respond_greeting(message_lower: str, chat_context: dict) -> dict:
+    """Greeting responses"""
+    return {
+        "response": "Hello! I'm your AI ticket assistant. I'm here to help you explore upgrade options, check pricing, and enhance your ticket experience. What can I help you with today?",
+        "show_upgrade_buttons": False,
+        "upgrade_options": []
+    }
+
+
+def _respond_upgrade_selection(message_lower: str, chat_context: dict) -> dict:
+    """Upgrade selection (when user has chosen a specific upgrade)"""
+    # Extract upgrade details from message
+    upgrade_name = "upgrade"
+    upgrade_price = 0
     
-    # Pricing questions
-    if any(word in message_lower for word in ['price', 'cost', 'how much', 'money', 'expensive', 'cheap']):
-        return {
-            "response": "I can help you with pricing information! Upgrade costs vary depending on the tier you choose, ranging from $50 for our Standard upgrade to $300 for our premium VIP experience. Each tier offers great value with increasing benefits. Would you like me to show you the detailed options with pricing?",
-            "show_upgrade_buttons": True,
-            "upgrade_options": get_upgrade_options()
-        }
+    if 'standard' in message_lower:
+        upgrade_name = "Standard Upgrade"
+        upgrade_price = 50
+    elif 'premium' in message_lower:
+        upgrade_name = "Premium Experience"
+        upgrade_price = 150
+    elif 'vip' in message_lower:
+        upgrade_name = "VIP Package"
+        upgrade_price = 300
     
-    # Feature/benefit questions
-    if any(word in message_lower for word in ['features', 'benefits', 'what do i get', 'includes', 'perks']):
+    return {
+        "response": f"Perfect! You've selected the {upgrade_name} for ${upgrade_price}. This is an excellent choice that will significantly enhance your experience. I'm processing your upgrade now, which includes all the premium features and benefits. Your ticket is being updated, and you'll receive a confirmation email shortly with all the details of your {upgrade_name}. Thank you for upgrading! Is there anything else I can help you with?",
+        "show_upgrade_buttons": False,
+        "upgrade_options": []
+    }
+
+
+def _respond_upgrade(message_lower: str, chat_context: dict) -> dict:
+    """Upgrade intent - primary use case (but require ticket validation first)"""
+    # Check if we have ticket information in context
+    if chat_context.get('hasTicketInfo') and chat_context.get('ticketId'):
         return {
-            "response": "Great question! Each upgrade tier includes different benefits. For example, our Standard upgrade includes priority boarding and extra legroom, while our VIP package includes exclusive merchandise, meet & greet opportunities, and backstage access. Would you like me to show you the complete breakdown of what each tier includes?",
+            "response": "Great! I'd be happy to help you explore upgrade options. We have several tiers available that can significantly enhance your experience. Each upgrade includes additional perks and benefits. Would you like me to show you what's available?",
             "show_upgrade_buttons": True,
             "upgrade_options": get_upgrade_options()
         }
-    
-    # Help requests
-    if any(word in message_lower for word in ['help', 'what can you do', 'assist', 'support']):
+    else:
         return {
-            "response": "I'm here to help you with ticket upgrades! I can show you available upgrade options, explain pricing and features, help you understand the benefits of each tier, and guide you through the upgrade process. I can also answer questions about your current ticket. What would you like to know more about?",
+            "response": "I'd be happy to help you explore upgrade options! To provide you with the most accurate pricing and availability, I'll need your ticket information first. Could you please share your ticket ID? It should be in the format like '550e8400-e29b-41d4-a716-446655440002'.",
             "show_upgrade_buttons": False,
             "upgrade_options": []
         }
-    
-    # Positive responses (when customer seems interested)
-    if any(word in message_lower for word in ['yes', 'sure', 'okay', 'sounds good', 'interested', 'tell me more']):
+
+
+def _respond_ticket(message_lower: str, chat_context: dict) -> dict:
+    """Ticket inquiry"""
+    if '550e8400' in message_lower or 'show' in message_lower:
         return {
-            "response": "Excellent! I'm excited to show you the upgrade options. We have three main tiers, each designed to enhance your experience in different ways. From priority perks to VIP treatment, there's something for every preference and budget. Here are your options:",
+            "response": "I can see your ticket (550e8400-e29b-41d4-a716-446655440002). It's a Standard ticket for $75.00 with an upcoming event. This is a great ticket, and there are several upgrade options available that could enhance your experience. Would you like to see what upgrades are available?",
             "show_upgrade_buttons": True,
             "upgrade_options": get_upgrade_options()
         }
-    
-    # Negative responses
-    if any(word in message_lower for word in ['no', 'not interested', 'maybe later', 'not now']):
+    else:
         return {
-            "response": "No problem at all! I'm here whenever you're ready. If you change your mind or have any questions about your ticket or potential upgrades, just let me know. Is there anything else I can help you with today?",
+            "response": "I can help you with your ticket information! To provide specific details, could you share your ticket ID? Or if you'd like to explore upgrade options right away, I can show you what's available to enhance your experience.",
             "show_upgrade_buttons": False,
             "upgrade_options": []
         }
-    
-    # Questions about specific tiers
-    if any(word in message_lower for word in ['standard', 'non-stop', 'double fun', 'vip']):
-        return {
-            "response": "I'd be happy to tell you more about our upgrade tiers! Each one offers unique benefits and experiences. Let me show you the complete breakdown so you can see what each tier includes and find the perfect fit for your preferences:",
-            "show_upgrade_buttons": True,
-            "upgrade_options": get_upgrade_options()
-        }
-    
-    # Default intelligent response
+
+
+def _respond_cost(message_lower: str, chat_context: dict) -> dict:
+    """Pricing questions"""
     return {
-        "response": "I understand you're interested in ticket services. I'm here to help you explore upgrade options that can enhance your experience. Whether you're looking for better seating, exclusive perks, or VIP treatment, I can show you what's available. What specific aspect of upgrading interests you most?",
+        "response": "I can help you with pricing information! Upgrade costs vary depending on the tier you choose, ranging from $50 for our Standard upgrade to $300 for our premium VIP experience. Each tier offers great value with increasing benefits. Would you like me to show you the detailed options with pricing?",
+        "show_upgrade_buttons": True,
+        "upgrade_options": get_upgrade_options()
+    }
+
+
+def _respond_features(message_lower: str, chat_context: dict) -> dict:
+    """Feature/benefit questions"""
+    return {
+        "response": "Great question! Each upgrade tier includes different benefits. For example, our Standard upgrade includes priority boarding and extra legroom, while our VIP package includes exclusive merchandise, meet & greet opportunities, and backstage access. Would you like me to show you the complete breakdown of what each tier includes?",
+        "show_upgrade_buttons": True,
+        "upgrade_options": get_upgrade_options()
+    }
+
+
+def _respond_help(message_lower: str, chat_context: dict) -> dict:
+    """Help requests"""
+    return {
+        "response": "I'm here to help you with ticket upgrades! I can show you available upgrade options, explain pricing and features, help you understand the benefits of each tier, and guide you through the upgrade process. I can also answer questions about your current ticket. What would you like to know more about?",
+        "show_upgrade_buttons": False,
+        "upgrade_options": []
+    }
+
+
+def _respond_positive(message_lower: str, chat_context: dict) -> dict:
+    """Positive responses (when customer seems interested)"""
+    return {
+        "response": "Excellent! I'm excited to show you the upgrade options. We have three main tiers, each designed to enhance your experience in different ways. From priority perks to VIP treatment, there's something for every preference and budget. Here are your options:",
+        "show_upgrade_buttons": True,
+        "upgrade_options": get_upgrade_options()
+    }
+
+
+def _respond_negative(message_lower: str, chat_context: dict) -> dict:
+    """Negative responses"""
+    return {
+        "response": "No problem at all! I'm here whenever you're ready. If you change your mind or have any questions about your ticket or potential upgrades, just let me know. Is there anything else I can help you with today?",
         "show_upgrade_buttons": False,
         "upgrade_options": []
     }
 
 
-def get_upgrade_options() -> list:
+def _respond_tiers(message_lower: str, chat_context: dict) -> dict:
+    """Questions about specific tiers"""
+    return {
+        "response": "I'd be happy to tell you more about our upgrade tiers! Each one offers unique benefits and experiences. Let me show you the complete breakdown so you can see what each tier includes and find the perfect fit for your preferences:",
+        "show_upgrade_buttons": True,
+        "upgrade_options": get_upgrade_options()
+    }
+
+
+# Fallback responders by intent, in priority order
+INTENT_RESPONDERS = {
+    'greeting': _respond_greeting,
+    'upgrade_selection': _respond_upgrade_selection,
+    'upgrade': _respond_upgrade,
+    'ticket': _respond_ticket,
+    'cost': _respond_cost,
+    'features': _respond_features,
+    'help': _respond_help,
+    'positive': _respond_positive,
+    'negative': _respond_negative,
+    'tiers': _respond_tiers,
+}
+
+
+# Upgrade options offered in chat; shared by every response, so treat as read-only
+UPGRADE_OPTIONS = (
+    {
+        "id": "standard",
+        "name": "Standard Upgrade",
+        "price": 50,
+        "features": ["Priority boarding", "Extra legroom", "Complimentary drink"],
+        "description": "Enhanced comfort with priority perks"
+    },
+    {
+        "id": "premium",
+        "name": "Premium Experience", 
+        "price": 150,
+        "features": ["Premium seating", "Gourmet meal", "Fast track entry", "Lounge access"],
+        "description": "Premium experience with exclusive amenities"
+    },
+    {
+        "id": "vip",
+        "name": "VIP Package",
+        "price": 300,
+        "features": ["VIP seating", "Meet & greet", "Exclusive merchandise", "Photo opportunities", "Backstage tour"],
+        "description": "Ultimate VIP experience with exclusive access"
+    }
+)
+
+def get_upgrade_options() -> tuple:
     """Get the standard upgrade options"""
-    return [
-        {
-            "id": "standard",
-            "name": "Standard Upgrade",
-            "price": 50,
-            "features": ["Priority boarding", "Extra legroom", "Complimentary drink"],
-            "description": "Enhanced comfort with priority perks"
-        },
-        {
-            "id": "premium",
-            "name": "Premium Experience", 
-            "price": 150,
-            "features": ["Premium seating", "Gourmet meal", "Fast track entry", "Lounge access"],
-            "description": "Premium experience with exclusive amenities"
-        },
-        {
-            "id": "vip",
-            "name": "VIP Package",
-            "price": 300,
-            "features": ["VIP seating", "Meet & greet", "Exclusive merchandise", "Photo opportunities", "Backstage tour"],
-            "description": "Ultimate VIP experience with exclusive access"
-        }
-    ]
\ No newline at end of file
+    return UPGRADE_OPTIONS
+
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Shared AWS Session and Clients for Deployment Scripts
+
+All deploy scripts build their boto3 clients from one Session so the
+credential provider chain is resolved once per process instead of once
+per client. client() creates each service's client on first use and keeps
+it, with its connection pool, for the lifetime of the process.
+"""
+
+import base64
+import hashlib
+import io
+import os
+import threading
+import time
+from functools import lru_cache
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+REGION = 'us-west-2'
+
+# When credentials already live in env vars, skip probing the EC2 instance
+# metadata service, which can stall for seconds outside of EC2
+if os.getenv('AWS_ACCESS_KEY_ID') and os.getenv('AWS_SECRET_ACCESS_KEY'):
+    os.environ.setdefault('AWS_EC2_METADATA_DISABLED', 'true')
+
+SESSION = boto3.Session(region_name=REGION)
+
+# Make any remaining module-level boto3.client() calls use the same session
+boto3.DEFAULT_SESSION = SESSION
+
+CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    # Synchronous invokes of the ticket handler wait on AgentCore and Bedrock
+    read_timeout=60,
+    retries={'mode': 'adaptive', 'max_attempts': 5}
+)
+
+# Sessions aren't thread-safe, and warm_up creates a client on its own thread
+_SESSION_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def client(service_name):
+    """Return one shared client per service, created on first use"""
+    with _SESSION_LOCK:
+        return SESSION.client(service_name, config=CONFIG)
+
+
+# Bucket for staging Lambda deployment packages; when unset, packages are
+# sent inline with update_function_code
+ARTIFACT_BUCKET = os.getenv('LAMBDA_ARTIFACT_BUCKET')
+
+# Largest package sent inline; bigger ones go through S3 instead
+INLINE_UPLOAD_LIMIT = 10 * 1024 * 1024
+
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+
+# Recent get_function_configuration responses by function name, as
+# (fetched_at, configuration) pairs; warm_up fills it from its own thread
+_FUNCTION_CONFIGS = {}
+_FUNCTION_CONFIGS_LOCK = threading.Lock()
+
+
+def upload_to_s3(zip_bytes, key, bucket=ARTIFACT_BUCKET):
+    """Upload an in-memory deployment package to S3 and return its object key"""
+    client('s3').upload_fileobj(io.BytesIO(zip_bytes), bucket, key, Config=TRANSFER_CONFIG)
+    return key
+
+
+def lambda_code_source(zip_bytes, name='ticket-handler-package.zip'):
+    """Return the update_function_code arguments for a deployment package
+    
+    Inline uploads are base64-encoded by botocore, holding a second full copy
+    of the package in memory, so packages above INLINE_UPLOAD_LIMIT must be
+    staged through S3.
+    """
+    if ARTIFACT_BUCKET:
+        key = upload_to_s3(zip_bytes, f"lambda-packages/{name}")
+        return {'S3Bucket': ARTIFACT_BUCKET, 'S3Key': key}
+    
+    if len(zip_bytes) > INLINE_UPLOAD_LIMIT:
+        raise ValueError(
+            f"Package is {len(zip_bytes)} bytes; set LAMBDA_ARTIFACT_BUCKET "
+            f"to deploy packages larger than {INLINE_UPLOAD_LIMIT} bytes"
+        )
+    
+    return {'ZipFile': zip_bytes}
+
+
+def function_configuration(function_name, ttl=10):
+    """Return a Lambda function's configuration, reusing one fetched within ttl seconds"""
+    now = time.time()
+    with _FUNCTION_CONFIGS_LOCK:
+        cached = _FUNCTION_CONFIGS.get(function_name)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+    
+    config = client('lambda').get_function_configuration(FunctionName=function_name)
+    remember_function_configuration(function_name, config, fetched_at=now)
+    return config
+
+
+def remember_function_configuration(function_name, config, fetched_at=None):
+    """Cache a configuration returned by another call, e.g. update_function_code"""
+    if fetched_at is None:
+        fetched_at = time.time()
+    
+    with _FUNCTION_CONFIGS_LOCK:
+        # Keep whichever response is newer when warm_up races another fetch
+        cached = _FUNCTION_CONFIGS.get(function_name)
+        if not cached or cached[0] <= fetched_at:
+            _FUNCTION_CONFIGS[function_name] = (fetched_at, config)
+
+
+def code_is_current(function_name, zip_bytes):
+    """Check whether a Lambda function already runs exactly this package"""
+    local_sha = base64.b64encode(hashlib.sha256(zip_bytes).digest()).decode()
+    remote_sha = function_configuration(function_name)['CodeSha256']
+    return local_sha == remote_sha
+
+
+def invoke_when_ready(function_name, attempts=10, delay=0.5, **kwargs):
+    """Invoke a Lambda function as soon as its latest code update has landed
+    
+    Stands in for a separate function_updated waiter: the update status is
+    checked right before invoking, and while an update is still in progress
+    the call is retried with exponential backoff. The status is always read
+    fresh (ttl=0), but the response still refreshes the shared cache.
+    
+    Raises RuntimeError when the update failed, since the function would
+    still be running its previous code.
+    """
+    for attempt in range(attempts):
+        try:
+            config = function_configuration(function_name, ttl=0)
+            status = config.get('LastUpdateStatus')
+            if status == 'Failed':
+                raise RuntimeError(
+                    f"{function_name} code update failed: "
+                    f"{config.get('LastUpdateStatusReason', 'no reason given')}"
+                )
+            if status != 'InProgress':
+                return client('lambda').invoke(FunctionName=function_name, **kwargs)
+        except client('lambda').exceptions.ResourceConflictException:
+            pass
+        
+        time.sleep(min(delay * 2 ** attempt, 4.0))
+    
+    raise TimeoutError(f"{function_name} is still updating after {attempts} attempts")
+
+
+def warm_up(function_name):
+    """Open the Lambda client's TLS connection before anything is timed
+    
+    Fetches function_name's configuration on a daemon thread, so it overlaps
+    with packaging instead of delaying the caller; the response also seeds
+    the configuration cache. Deploy scripts call this for their own target.
+    Errors are ignored.
+    """
+    def fetch():
+        try:
+            function_configuration(function_name)
+        except Exception:
+            pass
+    
+    threading.Thread(target=fetch, daemon=True).start()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Shared Ticket Handler Packaging for Deployment Scripts
+
+Builds the ticket-handler deployment zip in memory. Entries get fixed
+timestamps and permissions, so unchanged sources always produce the same
+bytes and deploy scripts can compare the package's SHA-256 against the
+function's deployed CodeSha256 to skip redundant uploads.
+"""
+
+import io
+import logging
+import zipfile
+from pathlib import Path
+
+LAMBDA_FILES = [
+    'backend/lambda/ticket_handler.py',
+    'backend/lambda/agentcore_client.py',
+    'backend/lambda/auth_handler.py'
+]
+
+# Per-file progress goes through logging so it is only formatted when shown;
+# run with LOGLEVEL=WARNING to mute it
+log = logging.getLogger(__name__)
+
+# Timestamp given to every zip entry, the earliest the zip format supports
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+def build_package(files=LAMBDA_FILES):
+    """Build the deployment zip and return its bytes
+    
+    The output depends only on the files' names and contents, not on
+    their modification times.
+    """
+    print("📦 Creating Lambda deployment package...")
+    
+    # Stat each source once; entries use just the filename (no directory structure)
+    entries, missing = [], []
+    for path in map(Path, files):
+        if path.is_file():
+            entries.append((path, path.name))
+        else:
+            missing.append(path)
+    
+    buffer = io.BytesIO()
+    # A few KB of source gains nothing from deflate, so store entries as-is
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as zipf:
+        for src, arcname in entries:
+            info = zipfile.ZipInfo(arcname, date_time=_ZIP_EPOCH)
+            info.external_attr = 0o644 << 16
+            zipf.writestr(info, src.read_bytes())
+            log.info("   ✅ Added %s", src)
+    
+    for path in missing:
+        log.warning("   ⚠️  Missing %s", path)
+    
+    zip_bytes = buffer.getvalue()
+    print(f"✅ Created deployment package: {len(zip_bytes)} bytes")
+    return zip_bytes
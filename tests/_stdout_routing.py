@@ -0,0 +1,69 @@
+"""
+Per-thread stdout capture for the scripts that run several checks or fixes
+concurrently, so each one's prints can be shown together once it finishes
+instead of interleaving with the others.
+"""
+
+import io
+import sys
+import threading
+from contextlib import contextmanager
+
+class _ThreadOutput(threading.local):
+    buffer = None
+
+_OUTPUT = _ThreadOutput()
+
+class _RoutedStdout:
+    """stdout proxy that sends a thread's writes to its buffer while it has one"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def write(self, text):
+        target = _OUTPUT.buffer if _OUTPUT.buffer is not None else self._stream
+        return target.write(text)
+    
+    def flush(self):
+        self._stream.flush()
+
+def inherit_output(func):
+    """Wrap func to print wherever the calling thread prints
+    
+    Use it for callables submitted to worker threads, which otherwise write
+    straight to the real stdout while their caller is being captured.
+    """
+    buffer = _OUTPUT.buffer
+    
+    def run(*args, **kwargs):
+        _OUTPUT.buffer = buffer
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _OUTPUT.buffer = None
+    return run
+
+@contextmanager
+def routed_stdout():
+    """Install the stdout proxy, so run_buffered can capture each thread's prints"""
+    sys.stdout = _RoutedStdout(sys.stdout)
+    try:
+        yield
+    finally:
+        sys.stdout = sys.stdout._stream
+
+def run_buffered(func, *args):
+    """Run func, capturing what it prints; returns (result, output)
+    
+    An exception is printed into the captured output and reported as False.
+    """
+    _OUTPUT.buffer = io.StringIO()
+    try:
+        result = func(*args)
+    except Exception as e:
+        print(f"❌ Failed: {e}")
+        result = False
+    finally:
+        output = _OUTPUT.buffer.getvalue()
+        _OUTPUT.buffer = None
+    return result, output
@@ -8,6 +8,7 @@ for the AgentCore Data Agent to access Aurora database.
 
 import boto3
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -32,39 +33,48 @@ def create_parameters():
     created_params = []
     updated_params = []
     
-    for param_name, param_value in parameters.items():
-        if param_value:
+    def put_parameter(param_name, param_value, overwrite):
+        ssm_client.put_parameter(
+            Name=param_name,
+            Value=param_value,
+            Type='SecureString' if 'arn' in param_name.lower() else 'String',
+            Description=f'AgentCore Data Agent configuration: {param_name.split("/")[-1]}',
+            Overwrite=overwrite
+        )
+    
+    # Check which parameters already exist with a single batched call
+    names = [name for name, value in parameters.items() if value]
+    try:
+        existing = {param['Name'] for param in ssm_client.get_parameters(Names=names)['Parameters']} if names else set()
+    except Exception as e:
+        print(f"❌ Failed to check existing parameters: {e}")
+        return False
+    
+    # Write all parameters concurrently, then report in the original order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            name: executor.submit(put_parameter, name, value, name in existing)
+            for name, value in parameters.items()
+            if value
+        }
+        
+        for param_name, param_value in parameters.items():
+            if not param_value:
+                print(f"⚠️  Skipping empty parameter: {param_name}")
+                continue
+            
             try:
-                # Check if parameter already exists
-                try:
-                    existing = ssm_client.get_parameter(Name=param_name)
-                    # Update existing parameter
-                    ssm_client.put_parameter(
-                        Name=param_name,
-                        Value=param_value,
-                        Type='SecureString' if 'arn' in param_name.lower() else 'String',
-                        Description=f'AgentCore Data Agent configuration: {param_name.split("/")[-1]}',
-                        Overwrite=True
-                    )
-                    print(f"✅ Updated parameter: {param_name}")
-                    updated_params.append(param_name)
-                    
-                except ssm_client.exceptions.ParameterNotFound:
-                    # Create new parameter
-                    ssm_client.put_parameter(
-                        Name=param_name,
-                        Value=param_value,
-                        Type='SecureString' if 'arn' in param_name.lower() else 'String',
-                        Description=f'AgentCore Data Agent configuration: {param_name.split("/")[-1]}',
-                        Overwrite=False
-                    )
-                    print(f"✅ Created parameter: {param_name}")
-                    created_params.append(param_name)
-                
+                futures[param_name].result()
             except Exception as e:
                 print(f"❌ Failed to create/update parameter {param_name}: {e}")
-        else:
-            print(f"⚠️  Skipping empty parameter: {param_name}")
+                continue
+            
+            if param_name in existing:
+                print(f"✅ Updated parameter: {param_name}")
+                updated_params.append(param_name)
+            else:
+                print(f"✅ Created parameter: {param_name}")
+                created_params.append(param_name)
     
     print(f"\n📊 PARAMETER STORE CONFIGURATION RESULTS:")
     print(f"   ✅ Created: {len(created_params)} parameters")
@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+Deploy Ticket Handler Fixes
+
+Single entry point for the ticket-handler deploy scripts. Every fix ships the
+same package, so this builds it once, deploys it with the shared boto3
+clients and then runs the checks for the selected fix.
+
+Usage:
+    python tests/deploy.py --fix {updated,pattern,selection,validation}
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from botocore.exceptions import WaiterError
+
+from _aws_clients import client, lambda_code_source, code_is_current, invoke_when_ready, remember_function_configuration, warm_up
+from _lambda_package import build_package
+
+FUNCTION_NAME = 'ticket-handler'
+
+_HEADERS = {
+    "Authorization": "Bearer test-token",
+    "Content-Type": "application/json"
+}
+
+_COMPACT = (',', ':')
+
+def deploy_lambda_function(zip_bytes):
+    """Deploy the Lambda function"""
+    print("\n🚀 Deploying Lambda function...")
+
+    try:
+        # Skip the upload when the deployed code is byte-identical
+        if code_is_current(FUNCTION_NAME, zip_bytes):
+            print("✅ Deployed code already matches this package, skipping update")
+            return True
+
+        # Update function code, staging the package through S3 when configured
+        response = client('lambda').update_function_code(
+            FunctionName=FUNCTION_NAME,
+            **lambda_code_source(zip_bytes)
+        )
+        # The response is the new configuration; keep the cached CodeSha256 current
+        remember_function_configuration(FUNCTION_NAME, response)
+
+        print(f"✅ Lambda function updated successfully")
+        print(f"   Function ARN: {response.get('FunctionArn')}")
+        print(f"   Last Modified: {response.get('LastModified')}")
+        print(f"   Code Size: {response.get('CodeSize')} bytes")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Failed to deploy Lambda function: {e}")
+        return False
+
+def _cached_resources(api_id, ttl=300):
+    """Return the API Gateway resources, reusing a recent on-disk copy"""
+    cache_path = Path(f'/tmp/apigw_{api_id}.json')
+
+    if cache_path.exists() and time.time() - cache_path.stat().st_mtime < ttl:
+        return json.loads(cache_path.read_text())
+
+    items = []
+    paginator = client('apigateway').get_paginator('get_resources')
+    for page in paginator.paginate(restApiId=api_id):
+        items.extend(page['items'])
+
+    cache_path.write_text(json.dumps(items))
+    return items
+
+def update_api_gateway_routes():
+    """Check that API Gateway routes /chat to the Ticket Handler"""
+
+    print("\nUpdating API Gateway routes...")
+
+    try:
+        # You'll need to find your API Gateway ID
+        # This is a placeholder - you may need to adjust based on your setup
+        api_id = 'qzd3j8cmn2'  # From the frontend API_BASE_URL
+
+        print(f"API Gateway ID: {api_id}")
+
+        # List existing resources to see current setup
+        resources_by_path = {resource['path']: resource for resource in _cached_resources(api_id)}
+
+        print("Current API resources:")
+        for path, resource in resources_by_path.items():
+            print(f"  {path} - {list(resource.get('resourceMethods', {}).keys())}")
+
+        # Check if /chat resource already exists
+        chat_resource = resources_by_path.get('/chat')
+
+        if chat_resource:
+            print("✅ /chat resource already exists")
+        else:
+            print("ℹ️  /chat resource needs to be created")
+            print("   You may need to create this manually in the AWS Console")
+            print("   or update your API Gateway configuration")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Failed to check API Gateway: {e}")
+        print("   You may need to manually configure the /chat route")
+        return False
+
+def _body(message, context, conversation_history=()):
+    """Serialize a chat request body without insignificant whitespace"""
+    return json.dumps({
+        "message": message,
+        "conversationHistory": list(conversation_history),
+        "context": context
+    }, separators=_COMPACT)
+
+def _invoke_chat(body):
+    """Invoke the ticket handler's /chat route once the latest code is live"""
+    test_payload = {
+        "httpMethod": "POST",
+        "path": "/chat",
+        "headers": _HEADERS,
+        "body": body
+    }
+
+    # LogType='Tail' returns the last 4 KB of the invocation's logs with the
+    # response, so failures can be diagnosed without a CloudWatch query
+    return invoke_when_ready(
+        FUNCTION_NAME,
+        InvocationType='RequestResponse',
+        LogType='Tail',
+        Payload=json.dumps(test_payload, separators=_COMPACT)
+    )
+
+def _log_tail(response):
+    """Decode the log tail returned by an invoke with LogType='Tail'"""
+    return base64.b64decode(response.get('LogResult', '')).decode(errors='replace')
+
+def _print_log_tail(tail, indent=''):
+    """Print the Lambda log tail of a failed invocation"""
+    if not tail:
+        return
+    print(f"{indent}📜 Lambda log tail:")
+    for line in tail.rstrip().splitlines():
+        print(f"{indent}   {line}")
+
+def wait_for_update():
+    """Wait for the code update to finish when the fix has no functional test"""
+    print("\n⏳ Waiting for function update to complete...")
+    try:
+        # Poll every second, but allow the waiter's default 300s in total
+        waiter = client('lambda').get_waiter('function_updated')
+        waiter.wait(FunctionName=FUNCTION_NAME, WaiterConfig={'Delay': 1, 'MaxAttempts': 300})
+    except WaiterError as e:
+        print(f"❌ Function update did not complete: {e}")
+        return False
+    
+    print("✅ Function update completed")
+    return True
+
+def test_deployment():
+    """Test the deployed function"""
+
+    print("\nTesting deployed function...")
+
+    try:
+        response = _invoke_chat(_body('Hello, I want to upgrade my ticket', {}))
+
+        # Parse response
+        result = json.loads(response['Payload'].read())
+
+        print(f"Test response status: {result.get('statusCode')}")
+
+        if result.get('statusCode') == 401:
+            print("✅ Function is working (401 = auth required, which is expected)")
+            return True
+        elif result.get('statusCode') == 200:
+            print("✅ Function is working perfectly!")
+            return True
+        else:
+            print(f"⚠️  Unexpected status code: {result.get('statusCode')}")
+            print(f"Response: {result.get('body')}")
+            _print_log_tail(_log_tail(response))
+            return False
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        return False
+
+def test_upgrade_selection():
+    """Test the upgrade selection functionality"""
+    print("\n🧪 Testing upgrade selection fix...")
+
+    body = _body(
+        "I want to proceed with the Premium Experience upgrade for 150. Please help me complete this upgrade.",
+        {
+            "ticketId": "550e8400-e29b-41d4-a716-446655440002",
+            "hasTicketInfo": True,
+            "selectedUpgrade": {
+                "id": "premium",
+                "name": "Premium Experience",
+                "price": 150,
+                "features": ["Premium seating", "Gourmet meal", "Fast track entry", "Lounge access"]
+            }
+        },
+        conversation_history=[
+            {"role": "assistant", "content": "Here are your upgrade options..."},
+            {"role": "user", "content": "I'd like the Premium Experience upgrade"}
+        ]
+    )
+
+    try:
+        response = _invoke_chat(body)
+
+        if response['StatusCode'] == 200:
+            result = json.loads(response['Payload'].read())
+
+            if result.get('statusCode') == 200:
+                body = json.loads(result.get('body', '{}'))
+                response_text = body.get('response', '')
+                show_buttons = body.get('showUpgradeButtons', False)
+
+                print(f"✅ Test successful!")
+                print(f"   Response length: {len(response_text)} characters")
+                print(f"   Response preview: {response_text[:150]}...")
+                print(f"   Show upgrade buttons: {show_buttons}")
+
+                # Check if response indicates upgrade processing (not reverting to greeting)
+                if any(phrase in response_text.lower() for phrase in ['perfect choice', 'excellent choice', 'processing', 'confirmation email']):
+                    print(f"🎉 UPGRADE SELECTION FIX SUCCESSFUL!")
+                    print(f"   Response properly handles upgrade selection")
+                    print(f"   No longer reverting to initial greeting")
+                    return True
+                else:
+                    print(f"⚠️  Response may still be using fallback logic")
+                    _print_log_tail(_log_tail(response))
+                    return False
+            else:
+                print(f"❌ Lambda returned error: {result.get('body')}")
+                _print_log_tail(_log_tail(response))
+                return False
+        else:
+            print(f"❌ Lambda invocation failed: Status {response['StatusCode']}")
+            _print_log_tail(_log_tail(response))
+            return False
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        return False
+
+def _invoke_scenario(scenario):
+    """Invoke the ticket handler with one test scenario
+
+    Returns the Lambda invocation status code, the parsed handler response
+    on success (otherwise None) and the invocation's log tail.
+    """
+    response = _invoke_chat(_body(scenario['message'], scenario['context']))
+    tail = _log_tail(response)
+
+    if response['StatusCode'] != 200:
+        return response['StatusCode'], None, tail
+
+    return response['StatusCode'], json.loads(response['Payload'].read()), tail
+
+def test_validation_and_pricing_fixes():
+    """Test both validation and pricing fixes"""
+    print("\n🧪 Testing validation and pricing fixes...")
+
+    # Test scenarios
+    test_scenarios = [
+        {
+            "name": "Upgrade without ticket (should require validation)",
+            "message": "I want to upgrade",
+            "context": {},  # No ticket info
+            "expected": "Should ask for ticket ID first"
+        },
+        {
+            "name": "Upgrade with ticket (should show options)",
+            "message": "I want to upgrade",
+            "context": {
+                "hasTicketInfo": True,
+                "ticketId": "550e8400-e29b-41d4-a716-446655440002"
+            },
+            "expected": "Should show upgrade options"
+        },
+        {
+            "name": "VIP upgrade selection (should work without MCP error)",
+            "message": "I'd like the VIP Package upgrade",
+            "context": {
+                "hasTicketInfo": True,
+                "ticketId": "550e8400-e29b-41d4-a716-446655440002",
+                "selectedUpgrade": {
+                    "id": "vip",
+                    "name": "VIP Package",
+                    "price": 300,
+                    "features": ["VIP seating", "Meet & greet", "Exclusive merchandise"]
+                }
+            },
+            "expected": "Should process upgrade without MCP parameter error"
+        }
+    ]
+
+    results = []
+
+    # The scenarios are independent, so invoke them concurrently and report in order.
+    # They stay RequestResponse rather than async Event invokes: the checks below
+    # read the handler's response body, which never reaches CloudWatch Logs
+    with ThreadPoolExecutor(max_workers=len(test_scenarios)) as executor:
+        futures = [executor.submit(_invoke_scenario, scenario) for scenario in test_scenarios]
+
+        for i, (scenario, future) in enumerate(zip(test_scenarios, futures), 1):
+            print(f"\n🎯 Test {i}: {scenario['name']}")
+            print(f"   Message: {scenario['message']}")
+            print(f"   Expected: {scenario['expected']}")
+
+            tail = ''
+            try:
+                status_code, result, tail = future.result()
+
+                if status_code == 200:
+                    if result.get('statusCode') == 200:
+                        body = json.loads(result.get('body', '{}'))
+                        response_text = body.get('response', '')
+                        show_buttons = body.get('showUpgradeButtons', False)
+
+                        print(f"   ✅ Success: {len(response_text)} characters")
+                        print(f"   Response: {response_text[:150]}...")
+                        print(f"   Show upgrade buttons: {show_buttons}")
+
+                        # Check specific expectations
+                        if scenario['name'] == "Upgrade without ticket (should require validation)":
+                            if "ticket information" in response_text.lower() or "ticket id" in response_text.lower():
+                                print(f"   🎉 VALIDATION FIX WORKING: Properly asks for ticket ID")
+                                status = "FIXED"
+                            else:
+                                print(f"   ❌ VALIDATION ISSUE: Still shows options without ticket")
+                                status = "BROKEN"
+
+                        elif scenario['name'] == "Upgrade with ticket (should show options)":
+                            if show_buttons:
+                                print(f"   🎉 VALIDATION FIX WORKING: Shows options with valid ticket")
+                                status = "FIXED"
+                            else:
+                                print(f"   ❌ VALIDATION ISSUE: Doesn't show options with valid ticket")
+                                status = "BROKEN"
+
+                        elif scenario['name'] == "VIP upgrade selection (should work without MCP error)":
+                            if "Error executing tool" not in response_text and "validation error" not in response_text:
+                                print(f"   🎉 PRICING FIX WORKING: No MCP parameter errors")
+                                status = "FIXED"
+                            else:
+                                print(f"   ❌ PRICING ISSUE: Still has MCP parameter errors")
+                                status = "BROKEN"
+                        else:
+                            status = "UNCLEAR"
+
+                        results.append({
+                            'scenario': scenario['name'],
+                            'success': True,
+                            'status': status,
+                            'length': len(response_text),
+                            'show_buttons': show_buttons
+                        })
+                    else:
+                        print(f"   ❌ Error: {result.get('body')}")
+                        results.append({
+                            'scenario': scenario['name'],
+                            'success': False,
+                            'error': result.get('body')
+                        })
+                else:
+                    print(f"   ❌ Lambda error: Status {status_code}")
+                    results.append({
+                        'scenario': scenario['name'],
+                        'success': False,
+                        'error': f"Lambda status {status_code}"
+                    })
+
+            except Exception as e:
+                print(f"   ❌ Exception: {e}")
+                results.append({
+                    'scenario': scenario['name'],
+                    'success': False,
+                    'error': str(e)
+                })
+
+            # Show what the handler logged for anything that did not pass
+            if results[-1].get('status') != 'FIXED':
+                _print_log_tail(tail, indent='   ')
+
+    return results
+
+def analyze_fix_results(results):
+    """Analyze the fix results"""
+    print("\n" + "=" * 60)
+    print("📊 VALIDATION AND PRICING FIX ANALYSIS")
+    print("=" * 60)
+
+    successful_tests = [r for r in results if r.get('success')]
+    fixed_tests = [r for r in results if r.get('status') == 'FIXED']
+    broken_tests = [r for r in results if r.get('status') == 'BROKEN']
+
+    print(f"Total Tests: {len(results)}")
+    print(f"Successful Tests: {len(successful_tests)}")
+    print(f"Fixed Issues: {len(fixed_tests)}")
+    print(f"Remaining Issues: {len(broken_tests)}")
+
+    if fixed_tests:
+        print(f"\n🎉 FIXES WORKING!")
+        for result in fixed_tests:
+            print(f"   ✅ {result['scenario']}")
+
+    if broken_tests:
+        print(f"\n❌ STILL BROKEN:")
+        for result in broken_tests:
+            print(f"   ❌ {result['scenario']}")
+
+    # Overall assessment
+    if len(fixed_tests) == len(results):
+        print(f"\n🎯 OVERALL ASSESSMENT: ALL FIXES WORKING")
+        print(f"   ✅ Ticket validation now required before showing upgrades")
+        print(f"   ✅ MCP tool parameter errors resolved")
+        print(f"   ✅ Customer chat interface fully functional")
+        return True
+    elif len(fixed_tests) >= len(results) * 0.5:
+        print(f"\n🎯 OVERALL ASSESSMENT: MOSTLY FIXED")
+        print(f"   Some issues resolved, others may need attention")
+    else:
+        print(f"\n🎯 OVERALL ASSESSMENT: NEEDS MORE WORK")
+        print(f"   Major issues still present")
+    return False
+
+def test_validation_fix():
+    """Run the validation and pricing scenarios and summarize them"""
+    return analyze_fix_results(test_validation_and_pricing_fixes())
+
+# Banner, follow-up checks and closing messages for each fix
+FIX_CONFIGS = {
+    'updated': {
+        'banner': [
+            "🚀 Deploying updated Ticket Handler with chat functionality...",
+            "   This will eliminate the need for a separate Chat Handler Lambda",
+            "   New flow: Frontend → Ticket Handler → AgentCore → Database",
+            ""
+        ],
+        'check_api_gateway': True,
+        'test': test_deployment,
+        'success': [
+            "\n🎉 Deployment successful!",
+            "\nNext steps:",
+            "1. The Ticket Handler now handles chat requests at POST /chat",
+            "2. The frontend is already configured to use this endpoint",
+            "3. You can now remove/disable the separate Chat Handler Lambda",
+            "4. Test the frontend to ensure chat works through Ticket Handler"
+        ],
+        'unverified': [
+            "\n⚠️  Deployment completed but tests failed",
+            "   Please check the Lambda function logs for issues"
+        ]
+    },
+    'pattern': {
+        'banner': [
+            "🔧 DEPLOYING UPGRADE PATTERN FIX",
+            "Fixing upgrade selection pattern to distinguish between:",
+            "  - General inquiry: 'I want to upgrade'",
+            "  - Specific selection: 'I want the Premium Experience upgrade'",
+            "=" * 70
+        ],
+        'check_api_gateway': False,
+        'test': wait_for_update,
+        'success': [
+            "\n🎯 DEPLOYMENT SUCCESSFUL!",
+            "   ✅ Lambda function updated with improved upgrade pattern matching",
+            "   ✅ General upgrade inquiries should now go to validation logic",
+            "   ✅ Specific upgrade selections should still work correctly"
+        ],
+        'unverified': []
+    },
+    'selection': {
+        'banner': [
+            "🔧 DEPLOYING UPGRADE SELECTION FIX",
+            "Fixing the issue where upgrade button clicks revert to initial greeting",
+            "=" * 70
+        ],
+        'check_api_gateway': False,
+        'test': test_upgrade_selection,
+        'success': [
+            "\n🎯 DEPLOYMENT SUCCESSFUL!",
+            "   ✅ Lambda function updated with upgrade selection handling",
+            "   ✅ Upgrade button clicks now properly processed",
+            "   ✅ No more reverting to initial AI greeting",
+            "   ✅ Customer chat interface ready for upgrade selections"
+        ],
+        'unverified': [
+            "\n⚠️  DEPLOYMENT COMPLETED BUT NEEDS VERIFICATION",
+            "   Lambda function deployed but test results unclear",
+            "   Manual testing recommended"
+        ]
+    },
+    'validation': {
+        'banner': [
+            "🔧 DEPLOYING VALIDATION AND PRICING FIXES",
+            "Fixing: 1) Upgrade options without ticket validation",
+            "        2) MCP tool parameter errors in pricing calls",
+            "=" * 70
+        ],
+        'check_api_gateway': False,
+        # The analysis prints its own overall assessment
+        'test': test_validation_fix,
+        'success': [],
+        'unverified': []
+    }
+}
+
+async def _deploy(zip_bytes, check_api_gateway):
+    """Update the function code, checking API Gateway alongside when asked"""
+    if not check_api_gateway:
+        return await asyncio.to_thread(deploy_lambda_function, zip_bytes)
+
+    # The two calls are independent, so run them side by side
+    updated, _ = await asyncio.gather(
+        asyncio.to_thread(deploy_lambda_function, zip_bytes),
+        asyncio.to_thread(update_api_gateway_routes)
+    )
+    return updated
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Deploy a ticket-handler fix")
+    parser.add_argument('--fix', choices=sorted(FIX_CONFIGS), default='updated',
+                        help="which fix to deploy and verify")
+    return parser.parse_args(argv)
+
+def main(fix=None):
+    """Main deployment function; returns True once the fix is deployed and verified"""
+    if fix is None:
+        fix = parse_args().fix
+    config = FIX_CONFIGS[fix]
+
+    # Plain messages on stdout so logged progress reads like the rest of the output
+    logging.basicConfig(level=os.environ.get('LOGLEVEL', 'INFO'), format='%(message)s', stream=sys.stdout)
+
+    print('\n'.join(config['banner']))
+
+    # Connect to Lambda while the package is built
+    warm_up(FUNCTION_NAME)
+
+    # Create deployment package
+    zip_bytes = build_package()
+
+    # Deploy Lambda function; the upload is skipped when the function's
+    # CodeSha256 already matches the package
+    if not asyncio.run(_deploy(zip_bytes, config['check_api_gateway'])):
+        print(f"\n❌ DEPLOYMENT FAILED")
+        print(f"   Could not update Lambda function")
+        return False
+
+    # Verify the fix
+    verified = config['test']()
+    messages = config['success'] if verified else config['unverified']
+    for line in messages:
+        print(line)
+    return verified
+
+if __name__ == "__main__":
+    # Non-zero exit status on failure, so CI notices a bad deploy
+    sys.exit(0 if main() else 1)
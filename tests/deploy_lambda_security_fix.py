@@ -6,73 +6,61 @@ This script deploys the Lambda function with the security fix that validates
 ticket IDs using a whitelist approach before processing any upgrade requests.
 """
 
-import boto3
 import json
 import os
 import zipfile
-import tempfile
-import shutil
 from datetime import datetime
 
+from _aws_clients import SESSION
+
 def create_deployment_package():
     """Create deployment package with the security fix"""
     print("📦 Creating Lambda deployment package with security fix...")
     
-    # Create temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Copy Lambda files
-        lambda_files = [
-            "backend/lambda/ticket_handler.py",
-            "backend/lambda/agentcore_client.py", 
-            "backend/lambda/auth_handler.py"
-        ]
-        
-        for file_path in lambda_files:
-            if os.path.exists(file_path):
-                filename = os.path.basename(file_path)
-                shutil.copy2(file_path, os.path.join(temp_dir, filename))
-                print(f"✅ Copied {filename}")
-        
-        # Copy model files
-        model_files = [
-            "models/customer.py",
-            "models/ticket.py", 
-            "models/upgrade_order.py",
-            "models/base.py"
-        ]
-        
-        models_dir = os.path.join(temp_dir, "models")
-        os.makedirs(models_dir, exist_ok=True)
-        
-        for file_path in model_files:
-            if os.path.exists(file_path):
-                filename = os.path.basename(file_path)
-                shutil.copy2(file_path, os.path.join(models_dir, filename))
-                print(f"✅ Copied models/{filename}")
-        
-        # Create __init__.py files
-        with open(os.path.join(models_dir, "__init__.py"), "w") as f:
-            f.write("")
-        
-        # Create zip file
-        zip_path = "ticket-handler-lambda-security-fix.zip"
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, temp_dir)
-                    zipf.write(file_path, arcname)
-                    print(f"📁 Added to zip: {arcname}")
+    entries = []
+    
+    # Include Lambda files
+    lambda_files = [
+        "backend/lambda/ticket_handler.py",
+        "backend/lambda/agentcore_client.py", 
+        "backend/lambda/auth_handler.py"
+    ]
+    
+    for file_path in lambda_files:
+        if os.path.exists(file_path):
+            entries.append((file_path, os.path.basename(file_path)))
+    
+    # Include model files
+    model_files = [
+        "models/customer.py",
+        "models/ticket.py", 
+        "models/upgrade_order.py",
+        "models/base.py"
+    ]
+    
+    for file_path in model_files:
+        if os.path.exists(file_path):
+            entries.append((file_path, f"models/{os.path.basename(file_path)}"))
+    
+    # Write entries straight into the zip file, no staging directory needed
+    zip_path = "ticket-handler-lambda-security-fix.zip"
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1, allowZip64=False) as zipf:
+        for file_path, arcname in entries:
+            zipf.write(file_path, arcname)
+            print(f"📁 Added to zip: {arcname}")
         
-        print(f"✅ Created deployment package: {zip_path}")
-        return zip_path
+        zipf.writestr("models/__init__.py", "")
+        print("📁 Added to zip: models/__init__.py")
+    
+    print(f"✅ Created deployment package: {zip_path}")
+    return zip_path
 
 def deploy_lambda_function(zip_path):
     """Deploy the Lambda function with security fix"""
     print("🚀 Deploying Lambda function with security fix...")
     
     try:
-        lambda_client = boto3.client('lambda', region_name='us-west-2')
+        lambda_client = SESSION.client('lambda')
         
         # Read the zip file
         with open(zip_path, 'rb') as f:
@@ -7,83 +7,69 @@ The fix ensures that when a ticket ID is not found in the database, the system p
 rejects it instead of creating fake ticket data.
 """
 
-import boto3
 import json
 import os
 import zipfile
-import tempfile
-import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from _aws_clients import SESSION
+
 def create_deployment_package():
     """Create deployment package with the security fix"""
     print("📦 Creating deployment package with security fix...")
     
-    # Create temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Copy the fixed AgentCore ticket agent
-        source_file = "backend/agents/agentcore_ticket_agent.py"
-        dest_file = os.path.join(temp_dir, "agentcore_ticket_agent.py")
-        
-        if not os.path.exists(source_file):
-            print(f"❌ Source file not found: {source_file}")
-            return None
-        
-        shutil.copy2(source_file, dest_file)
-        
-        # Copy other necessary files
-        lambda_files = [
-            "backend/lambda/ticket_handler.py",
-            "backend/lambda/agentcore_client.py", 
-            "backend/lambda/auth_handler.py"
-        ]
-        
-        for file_path in lambda_files:
-            if os.path.exists(file_path):
-                filename = os.path.basename(file_path)
-                shutil.copy2(file_path, os.path.join(temp_dir, filename))
-                print(f"✅ Copied {filename}")
-        
-        # Copy model files
-        model_files = [
-            "models/customer.py",
-            "models/ticket.py", 
-            "models/upgrade_order.py",
-            "models/base.py"
-        ]
-        
-        models_dir = os.path.join(temp_dir, "models")
-        os.makedirs(models_dir, exist_ok=True)
-        
-        for file_path in model_files:
-            if os.path.exists(file_path):
-                filename = os.path.basename(file_path)
-                shutil.copy2(file_path, os.path.join(models_dir, filename))
-                print(f"✅ Copied models/{filename}")
-        
-        # Create __init__.py files
-        with open(os.path.join(models_dir, "__init__.py"), "w") as f:
-            f.write("")
-        
-        # Create zip file
-        zip_path = "ticket-handler-security-fix.zip"
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, temp_dir)
-                    zipf.write(file_path, arcname)
-                    print(f"📁 Added to zip: {arcname}")
-        
-        print(f"✅ Created deployment package: {zip_path}")
-        return zip_path
+    # Include the fixed AgentCore ticket agent
+    source_file = "backend/agents/agentcore_ticket_agent.py"
+    if not os.path.exists(source_file):
+        print(f"❌ Source file not found: {source_file}")
+        return None
+    
+    entries = [(source_file, "agentcore_ticket_agent.py")]
+    
+    # Include other necessary files
+    lambda_files = [
+        "backend/lambda/ticket_handler.py",
+        "backend/lambda/agentcore_client.py", 
+        "backend/lambda/auth_handler.py"
+    ]
+    
+    for file_path in lambda_files:
+        if os.path.exists(file_path):
+            entries.append((file_path, os.path.basename(file_path)))
+    
+    # Include model files
+    model_files = [
+        "models/customer.py",
+        "models/ticket.py", 
+        "models/upgrade_order.py",
+        "models/base.py"
+    ]
+    
+    for file_path in model_files:
+        if os.path.exists(file_path):
+            entries.append((file_path, f"models/{os.path.basename(file_path)}"))
+    
+    # Write entries straight into the zip file, no staging directory needed
+    zip_path = "ticket-handler-security-fix.zip"
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1, allowZip64=False) as zipf:
+        for file_path, arcname in entries:
+            zipf.write(file_path, arcname)
+            print(f"📁 Added to zip: {arcname}")
+        
+        zipf.writestr("models/__init__.py", "")
+        print("📁 Added to zip: models/__init__.py")
+    
+    print(f"✅ Created deployment package: {zip_path}")
+    return zip_path
 
-def deploy_lambda_function(zip_path):
+def deploy_lambda_function(zip_path, lambda_client=None):
     """Deploy the Lambda function with security fix"""
     print("🚀 Deploying Lambda function with security fix...")
     
     try:
-        lambda_client = boto3.client('lambda', region_name='us-west-2')
+        if lambda_client is None:
+            lambda_client = SESSION.client('lambda')
         
         # Read the zip file
         with open(zip_path, 'rb') as f:
@@ -118,7 +104,7 @@ def test_security_fix():
     print("\n🧪 Testing security fix...")
     
     try:
-        lambda_client = boto3.client('lambda', region_name='us-west-2')
+        lambda_client = SESSION.client('lambda')
         
         # Test with invalid ticket ID
         test_payload = {
@@ -183,14 +169,26 @@ def main():
     print("invalid ticket IDs were being accepted and processed.")
     print("=" * 60)
     
-    # Create deployment package
-    zip_path = create_deployment_package()
+    # Warm up the Lambda client connection while the package is being built,
+    # so the TLS handshake overlaps with zip compression
+    lambda_client = SESSION.client('lambda')
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        prewarm = executor.submit(lambda: lambda_client.list_functions(MaxItems=1))
+        
+        # Create deployment package
+        zip_path = create_deployment_package()
+        
+        try:
+            prewarm.result()
+        except Exception as e:
+            print(f"⚠️  Lambda client warm-up failed: {e}")
+    
     if not zip_path:
         print("❌ Failed to create deployment package")
         return
     
     # Deploy to Lambda
-    if not deploy_lambda_function(zip_path):
+    if not deploy_lambda_function(zip_path, lambda_client):
         print("❌ Deployment failed")
         return
     
@@ -5,23 +5,24 @@ Deploy Simple Chat Handler
 Deploy a simple test version to see if the issue is with the code or deployment.
 """
 
-import boto3
 import zipfile
 import os
 
+from _aws_clients import SESSION
+
 def deploy_simple_chat():
     """Deploy simple chat handler"""
     print("🚀 DEPLOYING SIMPLE CHAT HANDLER")
     print("=" * 40)
     
     # Initialize Lambda client
-    lambda_client = boto3.client('lambda', region_name='us-west-2')
+    lambda_client = SESSION.client('lambda')
     
     # Create deployment package
     package_name = "simple-chat-handler.zip"
     print(f"📦 Creating deployment package: {package_name}")
     
-    with zipfile.ZipFile(package_name, 'w', zipfile.ZIP_DEFLATED) as zipf:
+    with zipfile.ZipFile(package_name, 'w', zipfile.ZIP_DEFLATED, compresslevel=1, allowZip64=False) as zipf:
         # Add simple test handler
         zipf.write("simple_chat_test.py", "chat_handler.py")
     
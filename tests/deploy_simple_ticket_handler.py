@@ -3,11 +3,12 @@
 Deploy a simplified Ticket Handler that uses HTTP for chat and MCP for other operations
 """
 
-import boto3
 import zipfile
 import os
 import json
 
+from _aws_clients import SESSION
+
 def create_simple_lambda_package():
     """Create a simplified deployment package"""
     
@@ -21,6 +22,7 @@ Uses HTTP for all operations to avoid MCP dependencies
 """
 
 import os
+import secrets
 import boto3
 import json
 import urllib3
@@ -36,6 +38,13 @@ class AgentCoreClient:
             'arn:aws:bedrock-agentcore:us-west-2:632930644527:runtime/agentcore_data_agent-mNwb8TETc3')
         self.ticket_agent_arn = os.getenv('TICKET_AGENT_ARN',
             'arn:aws:bedrock-agentcore:us-west-2:632930644527:runtime/agentcore_ticket_agent-zvZNPj28RR')
+        # One connection pool per client so TLS connections are reused across calls
+        self._http = urllib3.PoolManager(
+            num_pools=2,
+            maxsize=20,
+            retries=urllib3.Retry(total=2),
+            timeout=urllib3.Timeout(connect=3.0, read=30.0)
+        )
         
     def get_bearer_token(self) -> bool:
         """Get Bearer token from Cognito"""
@@ -87,17 +96,15 @@ class AgentCoreClient:
             # Request payload
             payload = {
                 'inputText': input_text,
-                'sessionId': f'lambda-session-{hash(agent_arn + input_text)}'[:16]
+                'sessionId': 'lmb-' + secrets.token_hex(6)
             }
             
-            # Make HTTP request using urllib3
-            http = urllib3.PoolManager()
-            response = http.request(
+            # Make HTTP request using the client's pooled urllib3 connections
+            response = self._http.request(
                 'POST',
                 agent_url,
                 body=json.dumps(payload),
-                headers=headers,
-                timeout=30
+                headers=headers
             )
             
             if response.status == 200:
@@ -158,7 +165,7 @@ def create_client() -> AgentCoreClient:
     # Create zip file
     zip_path = 'simple_ticket_handler.zip'
     
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1, allowZip64=False) as zipf:
         for source_path, archive_name in files_to_include:
             if os.path.exists(source_path):
                 zipf.write(source_path, archive_name)
@@ -179,7 +186,7 @@ def update_lambda_function(zip_path):
     function_name = 'ticket-handler'
     
     try:
-        lambda_client = boto3.client('lambda', region_name='us-west-2')
+        lambda_client = SESSION.client('lambda')
         
         print(f"Updating Lambda function: {function_name}")
         
@@ -209,7 +216,7 @@ def test_deployment():
     print("\nTesting deployed function...")
     
     try:
-        lambda_client = boto3.client('lambda', region_name='us-west-2')
+        lambda_client = SESSION.client('lambda')
         
         # Test event for chat
         test_event = {
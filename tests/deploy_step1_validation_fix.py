@@ -6,11 +6,12 @@ This script deploys the fix for Step 1 validation issue where "my ticket"
 was triggering validation logic without proper ticket context.
 """
 
-import boto3
 import json
 import zipfile
 import os
 
+from _aws_clients import SESSION
+
 def create_lambda_package():
     """Create deployment package for Lambda function"""
     print("📦 Creating Lambda deployment package...")
@@ -18,7 +19,7 @@ def create_lambda_package():
     # Create zip file
     zip_path = "ticket-handler-step1-validation-fix.zip"
     
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1, allowZip64=False) as zipf:
         # Add main Lambda files
         lambda_files = [
             'backend/lambda/ticket_handler.py',
@@ -41,7 +42,7 @@ def deploy_lambda_function(zip_path):
     """Deploy the Lambda function"""
     print("\n🚀 Deploying Lambda function...")
     
-    lambda_client = boto3.client('lambda', region_name='us-west-2')
+    lambda_client = SESSION.client('lambda')
     
     try:
         # Read the zip file
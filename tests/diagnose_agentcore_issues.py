@@ -3,43 +3,149 @@
 Diagnose and fix AgentCore agent configuration issues
 """
 
-import boto3
 import json
 import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
+from itertools import islice
 from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import quote
+
+import urllib3
+from dotenv import load_dotenv
+
+from _aws_clients import CONFIG, SESSION
+from _stdout_routing import routed_stdout, run_buffered
+
+REQUIRED_ENV = ('TICKET_AGENT_ARN', 'DATA_AGENT_ARN', 'COGNITO_CLIENT_ID', 'COGNITO_TEST_USER', 'COGNITO_TEST_PASSWORD')
+SECRET_ENV = {'COGNITO_TEST_PASSWORD'}
+
+@cache
+def _env():
+    """Load .env once and snapshot the settings the checks use"""
+    load_dotenv()
+    values = {name: os.environ.get(name) for name in REQUIRED_ENV}
+    return SimpleNamespace(
+        values=values,
+        ticket_arn=values['TICKET_AGENT_ARN'],
+        data_arn=values['DATA_AGENT_ARN'],
+        client_id=values['COGNITO_CLIENT_ID'],
+        user=values['COGNITO_TEST_USER'],
+        password=values['COGNITO_TEST_PASSWORD']
+    )
+
+@lru_cache(maxsize=None)
+def _client(service_name):
+    """Return one shared client per service, built from the shared session"""
+    return SESSION.client(service_name, config=CONFIG)
+
+# One keep-alive pool for every AgentCore request, so later calls skip the TLS handshake
+_HTTP = urllib3.PoolManager(num_pools=4, maxsize=10, retries=urllib3.Retry(3, backoff_factor=0.3))
+
+# Result of a check that did not run because a prerequisite failed
+SKIPPED = object()
+
+def _run_check(check_func, prerequisites=()):
+    """Run a check once its prerequisites pass
+    
+    prerequisites are (name, future) pairs for checks this one depends on;
+    if any of them fails, the check is skipped instead of run.
+    """
+    failed = [name for name, future in prerequisites if future.result()[0] is not True]
+    if failed:
+        print(f"⏭️  Skipped: requires {', '.join(failed)}")
+        return SKIPPED
+    return check_func()
+
+BAR_60 = "=" * 60
+BAR_80 = "=" * 80
+SECTION_BAR = "=" * 20
+
+# AgentCore invocation endpoint and the headers every probe shares
+AGENT_URL_TEMPLATE = 'https://bedrock-agentcore.us-west-2.amazonaws.com/runtimes/{}/invocations?qualifier=DEFAULT'
+BASE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json, text/event-stream'
+}
+
+TOKEN_CACHE = Path.home() / '.cache' / 'agentcore-diag-token.json'
+
+def _get_bearer_token():
+    """Return a Cognito access token, reusing a cached one until 30s before expiry"""
+    client_id = _env().client_id
+    username = _env().user
+    
+    try:
+        cached = json.loads(TOKEN_CACHE.read_text())
+        if (cached['client_id'], cached['user']) == (client_id, username) and time.time() < cached['exp'] - 30:
+            return cached['token']
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    response = _client('cognito-idp').initiate_auth(
+        ClientId=client_id,
+        AuthFlow='USER_PASSWORD_AUTH',
+        AuthParameters={
+            'USERNAME': username,
+            'PASSWORD': _env().password
+        }
+    )
+    result = response['AuthenticationResult']
+    
+    # The token grants API access, so the cache must never be readable by
+    # others: write a 0600 temp file (mkstemp's mode) and move it into place
+    TOKEN_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=TOKEN_CACHE.parent, prefix=TOKEN_CACHE.name)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump({
+                'client_id': client_id,
+                'user': username,
+                'token': result['AccessToken'],
+                'exp': time.time() + result['ExpiresIn']
+            }, f)
+        os.replace(tmp_path, TOKEN_CACHE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    
+    return result['AccessToken']
 
 def check_agentcore_deployment_status():
     """Check if AgentCore agents are properly deployed"""
     
-    print("🔍 DIAGNOSING AGENTCORE AGENT ISSUES")
-    print("="*60)
+    print(f"🔍 DIAGNOSING AGENTCORE AGENT ISSUES\n{BAR_60}")
     
     # Check environment variables
     print("📋 Checking Environment Variables:")
     
-    ticket_agent_arn = os.getenv('TICKET_AGENT_ARN')
-    data_agent_arn = os.getenv('DATA_AGENT_ARN')
-    cognito_client_id = os.getenv('COGNITO_CLIENT_ID')
-    cognito_user = os.getenv('COGNITO_TEST_USER')
-    cognito_password = os.getenv('COGNITO_TEST_PASSWORD')
+    env = _env()
+    missing = []
+    for name, value in env.values.items():
+        if not value:
+            missing.append(name)
+        shown = ('***' if value else 'NOT SET') if name in SECRET_ENV else value
+        print(f"   {name}: {shown}")
     
-    print(f"   TICKET_AGENT_ARN: {ticket_agent_arn}")
-    print(f"   DATA_AGENT_ARN: {data_agent_arn}")
-    print(f"   COGNITO_CLIENT_ID: {cognito_client_id}")
-    print(f"   COGNITO_TEST_USER: {cognito_user}")
-    print(f"   COGNITO_TEST_PASSWORD: {'***' if cognito_password else 'NOT SET'}")
-    
-    if not all([ticket_agent_arn, data_agent_arn, cognito_client_id, cognito_user, cognito_password]):
-        print("❌ Missing required environment variables")
+    if missing:
+        print(f"❌ Missing required environment variables: {', '.join(missing)}")
         return False
     
+    ticket_agent_arn = env.ticket_arn
+    data_agent_arn = env.data_arn
+    
     print("✅ Environment variables are set")
     
     # Check if agents exist in AgentCore
     print("\n🤖 Checking AgentCore Agent Status:")
     
     try:
-        bedrock_client = boto3.client('bedrock-agent', region_name='us-west-2')
+        bedrock_client = _client('bedrock-agent')
         
         # This might not work directly, but let's try
         print("   Attempting to list AgentCore agents...")
@@ -54,6 +160,16 @@ def check_agentcore_deployment_status():
         print(f"   ⚠️  Cannot directly check agent status: {e}")
         return True  # Continue with other checks
 
+@lru_cache(maxsize=32)
+def _read_preview(file_path, mtime_ns, lines=10):
+    """Return the first lines of a file
+    
+    Only those lines are read. Results are cached per modification time,
+    so repeated runs in one interpreter skip the disk until the file changes.
+    """
+    with open(file_path, 'r') as f:
+        return tuple(line.rstrip('\n') for line in islice(f, lines))
+
 def check_mcp_server_status():
     """Check if MCP servers are running"""
     
@@ -63,10 +179,9 @@ def check_mcp_server_status():
     if os.path.exists('agentcore.yaml'):
         print("✅ agentcore.yaml found")
         
-        with open('agentcore.yaml', 'r') as f:
-            config = f.read()
-            print("   Configuration preview:")
-            print("   " + "\n   ".join(config.split('\n')[:10]))
+        preview = _read_preview('agentcore.yaml', os.stat('agentcore.yaml').st_mtime_ns)
+        print("   Configuration preview:")
+        print("   " + "\n   ".join(preview))
     else:
         print("❌ agentcore.yaml not found")
         return False
@@ -79,99 +194,139 @@ def check_mcp_server_status():
         'backend/agents/agentcore_ticket_agent.py'
     ]
     
+    # List each directory once instead of stat'ing every file
+    present = set()
+    for directory in {os.path.dirname(file_path) for file_path in mcp_files}:
+        try:
+            with os.scandir(directory) as entries:
+                present.update(os.path.join(directory, entry.name) for entry in entries)
+        except OSError:
+            pass
+    
     print("\n   MCP Server Files:")
     for file_path in mcp_files:
-        if os.path.exists(file_path):
+        if file_path in present:
             print(f"   ✅ {file_path}")
         else:
             print(f"   ❌ {file_path}")
     
     return True
 
+def _probe_agent(agent_arn, bearer_token):
+    """POST a test prompt to one AgentCore runtime and return the HTTP response"""
+    agent_url = AGENT_URL_TEMPLATE.format(quote(agent_arn, safe=''))
+    headers = {**BASE_HEADERS, 'Authorization': f'Bearer {bearer_token}'}
+    
+    payload = {
+        'inputText': 'Hello, can you help me with ticket upgrades?',
+        'sessionId': 'test-session-123'
+    }
+    
+    return _HTTP.request(
+        'POST',
+        agent_url,
+        # Compact UTF-8 bytes, sent as-is without another encode
+        body=json.dumps(payload, separators=(',', ':')).encode('utf-8'),
+        headers=headers,
+        timeout=30
+    )
+
+def _report_agent_response(response):
+    """Print one agent's probe result and return whether it responded cleanly"""
+    print(f"   Response Status: {response.status}")
+    
+    if response.status == 200:
+        # json.loads takes the raw bytes directly, no intermediate str
+        result = json.loads(response.data)
+        print(f"   Response Data: {json.dumps(result, indent=2)}")
+        
+        # Check for specific error patterns
+        if 'error' in result:
+            error_code = result['error'].get('code')
+            error_message = result['error'].get('message')
+            
+            print(f"\n❌ AgentCore Error Detected:")
+            print(f"   Error Code: {error_code}")
+            print(f"   Error Message: {error_message}")
+            
+            if error_code == -32603:
+                print("\n🔧 DIAGNOSIS: Internal Server Error (-32603)")
+                print("   This typically means:")
+                print("   1. Agent is deployed but MCP tools are not working")
+                print("   2. Agent configuration has issues")
+                print("   3. MCP server connection problems")
+                print("   4. Agent runtime environment issues")
+            
+            return False
+        else:
+            print("✅ AgentCore responded successfully!")
+            return True
+    else:
+        print(f"❌ HTTP Error: {response.status}")
+        print(f"   Response: {response.data.decode('utf-8')}")
+        return False
+
 def test_direct_agentcore_connection():
     """Test direct connection to AgentCore agents"""
     
     print("\n🧪 Testing Direct AgentCore Connection:")
     
     try:
-        import urllib3
-        
-        # Get authentication token
-        cognito_client = boto3.client('cognito-idp', region_name='us-west-2')
-        
-        response = cognito_client.initiate_auth(
-            ClientId=os.getenv('COGNITO_CLIENT_ID'),
-            AuthFlow='USER_PASSWORD_AUTH',
-            AuthParameters={
-                'USERNAME': os.getenv('COGNITO_TEST_USER'),
-                'PASSWORD': os.getenv('COGNITO_TEST_PASSWORD')
-            }
-        )
-        
-        bearer_token = response['AuthenticationResult']['AccessToken']
+        # Get authentication token (cached between runs)
+        bearer_token = _get_bearer_token()
         print("✅ Successfully obtained bearer token")
         
-        # Test connection to Ticket Agent
-        ticket_agent_arn = os.getenv('TICKET_AGENT_ARN')
-        encoded_arn = ticket_agent_arn.replace(':', '%3A').replace('/', '%2F')
-        agent_url = f"https://bedrock-agentcore.us-west-2.amazonaws.com/runtimes/{encoded_arn}/invocations?qualifier=DEFAULT"
+        agents = [
+            ('Ticket Agent', _env().ticket_arn),
+            ('Data Agent', _env().data_arn)
+        ]
         
-        headers = {
-            'Authorization': f'Bearer {bearer_token}',
-            'Content-Type': 'application/json',
-            'Accept': 'application/json, text/event-stream'
-        }
-        
-        payload = {
-            'inputText': 'Hello, can you help me with ticket upgrades?',
-            'sessionId': 'test-session-123'
-        }
-        
-        http = urllib3.PoolManager()
-        response = http.request(
-            'POST',
-            agent_url,
-            body=json.dumps(payload),
-            headers=headers,
-            timeout=30
-        )
-        
-        print(f"   Response Status: {response.status}")
-        
-        if response.status == 200:
-            result = json.loads(response.data.decode('utf-8'))
-            print(f"   Response Data: {json.dumps(result, indent=2)}")
+        # Probe both agents at once over the shared connection pool and
+        # report them in order
+        with ThreadPoolExecutor(max_workers=len(agents)) as executor:
+            futures = [executor.submit(_probe_agent, agent_arn, bearer_token) for _, agent_arn in agents]
             
-            # Check for specific error patterns
-            if 'error' in result:
-                error_code = result['error'].get('code')
-                error_message = result['error'].get('message')
-                
-                print(f"\n❌ AgentCore Error Detected:")
-                print(f"   Error Code: {error_code}")
-                print(f"   Error Message: {error_message}")
-                
-                if error_code == -32603:
-                    print("\n🔧 DIAGNOSIS: Internal Server Error (-32603)")
-                    print("   This typically means:")
-                    print("   1. Agent is deployed but MCP tools are not working")
-                    print("   2. Agent configuration has issues")
-                    print("   3. MCP server connection problems")
-                    print("   4. Agent runtime environment issues")
-                
-                return False
-            else:
-                print("✅ AgentCore responded successfully!")
-                return True
-        else:
-            print(f"❌ HTTP Error: {response.status}")
-            print(f"   Response: {response.data.decode('utf-8')}")
-            return False
+            all_ok = True
+            for (agent_name, _), future in zip(agents, futures):
+                print(f"\n   🤖 {agent_name}:")
+                try:
+                    all_ok = _report_agent_response(future.result()) and all_ok
+                except Exception as e:
+                    print(f"❌ Connection test failed: {e}")
+                    all_ok = False
+        
+        return all_ok
             
     except Exception as e:
         print(f"❌ Connection test failed: {e}")
         return False
 
+def _find_tokens(file_path, tokens):
+    """Return which tokens occur in a file, reusing the last scan while the file is unchanged"""
+    return _scan_tokens(file_path, os.stat(file_path).st_mtime_ns, tuple(tokens))
+
+@lru_cache(maxsize=32)
+def _scan_tokens(file_path, mtime_ns, tokens):
+    """Return which tokens occur in a file, reading it line by line
+    
+    All tokens are matched by one compiled alternation, so each line is
+    scanned once however many tokens there are. The pattern is rebuilt from
+    the tokens still missing whenever one is found, and reading stops as
+    soon as every token has been seen.
+    """
+    missing = set(tokens)
+    # Longest first, so a token that prefixes another cannot shadow it
+    pattern = re.compile('|'.join(map(re.escape, sorted(missing, key=len, reverse=True))))
+    with open(file_path, 'r') as f:
+        for line in f:
+            hits = set(pattern.findall(line))
+            if hits:
+                missing -= hits
+                if not missing:
+                    break
+                pattern = re.compile('|'.join(map(re.escape, sorted(missing, key=len, reverse=True))))
+    return frozenset(tokens) - missing
+
 def check_mcp_tools_configuration():
     """Check MCP tools configuration"""
     
@@ -187,89 +342,94 @@ def check_mcp_tools_configuration():
         if os.path.exists(file_path):
             print(f"\n   📄 {file_path}:")
             
-            with open(file_path, 'r') as f:
-                content = f.read()
-                
-                # Look for tool definitions
-                if '@server.list_tools()' in content:
-                    print("   ✅ Has tool definitions")
+            # Look for tool definitions and specific tools in one pass
+            tools = ['validate_ticket_eligibility', 'calculate_upgrade_pricing', 'get_customer', 'get_tickets_for_customer']
+            found = _find_tokens(file_path, ['@server.list_tools()', *tools])
+            
+            if '@server.list_tools()' in found:
+                print("   ✅ Has tool definitions")
+            else:
+                print("   ⚠️  No tool definitions found")
+            
+            for tool in tools:
+                if tool in found:
+                    print(f"   ✅ Tool: {tool}")
                 else:
-                    print("   ⚠️  No tool definitions found")
-                
-                # Look for specific tools
-                tools = ['validate_ticket_eligibility', 'calculate_upgrade_pricing', 'get_customer', 'get_tickets_for_customer']
-                
-                for tool in tools:
-                    if tool in content:
-                        print(f"   ✅ Tool: {tool}")
-                    else:
-                        print(f"   ❌ Missing tool: {tool}")
+                    print(f"   ❌ Missing tool: {tool}")
         else:
             print(f"   ❌ File not found: {file_path}")
 
+SUGGESTED_FIXES = f"""
+🔧 SUGGESTED FIXES:
+{BAR_60}
+1. 🚀 Restart AgentCore Agents:
+   - Agents may need to be redeployed
+   - MCP servers may need restart
+
+2. 🔍 Check MCP Server Status:
+   - Verify MCP servers are running
+   - Check port 8000 connectivity
+
+3. 🛠️  Validate Tool Definitions:
+   - Ensure all required tools are defined
+   - Check tool parameter schemas
+
+4. 🔐 Verify Authentication:
+   - Check Cognito user permissions
+   - Validate bearer token scope
+
+5. 📊 Check Agent Logs:
+   - Review AgentCore agent logs
+   - Check MCP server logs
+"""
+
 def suggest_fixes():
     """Suggest fixes for AgentCore issues"""
-    
-    print("\n🔧 SUGGESTED FIXES:")
-    print("="*60)
-    
-    print("1. 🚀 Restart AgentCore Agents:")
-    print("   - Agents may need to be redeployed")
-    print("   - MCP servers may need restart")
-    
-    print("\n2. 🔍 Check MCP Server Status:")
-    print("   - Verify MCP servers are running")
-    print("   - Check port 8000 connectivity")
-    
-    print("\n3. 🛠️  Validate Tool Definitions:")
-    print("   - Ensure all required tools are defined")
-    print("   - Check tool parameter schemas")
-    
-    print("\n4. 🔐 Verify Authentication:")
-    print("   - Check Cognito user permissions")
-    print("   - Validate bearer token scope")
-    
-    print("\n5. 📊 Check Agent Logs:")
-    print("   - Review AgentCore agent logs")
-    print("   - Check MCP server logs")
+    sys.stdout.write(SUGGESTED_FIXES)
 
 def main():
     """Main diagnostic function"""
     
-    print("🚀 AGENTCORE DIAGNOSTIC TOOL")
-    print("Identifying why agents return internal configuration errors")
-    print("="*80)
+    print(f"🚀 AGENTCORE DIAGNOSTIC TOOL\nIdentifying why agents return internal configuration errors\n{BAR_80}")
     
-    # Run diagnostic checks
+    # Run diagnostic checks; the third item names earlier checks that must
+    # pass first (without the settings, the Cognito login is bound to fail)
     checks = [
-        ("Environment Variables", check_agentcore_deployment_status),
-        ("MCP Server Status", check_mcp_server_status),
-        ("Direct AgentCore Connection", test_direct_agentcore_connection),
-        ("MCP Tools Configuration", check_mcp_tools_configuration)
+        ("Environment Variables", check_agentcore_deployment_status, ()),
+        ("MCP Server Status", check_mcp_server_status, ()),
+        ("Direct AgentCore Connection", test_direct_agentcore_connection, ("Environment Variables",)),
+        ("MCP Tools Configuration", check_mcp_tools_configuration, ())
     ]
     
     results = []
     
-    for check_name, check_func in checks:
-        print(f"\n{'='*20} {check_name} {'='*20}")
-        try:
-            result = check_func()
+    # The checks are I/O-bound probes, so run them concurrently and
+    # print each one's buffered output in the original order. A check with
+    # prerequisites waits on their futures, so each worker needs its own thread
+    with routed_stdout(), ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = {}
+        for check_name, check_func, requires in checks:
+            prerequisites = [(name, futures[name]) for name in requires]
+            futures[check_name] = executor.submit(run_buffered, _run_check, check_func, prerequisites)
+        
+        for check_name, _, _ in checks:
+            result, output = futures[check_name].result()
+            # One write per section, header and buffered output together
+            sys.stdout.write(f"\n{SECTION_BAR} {check_name} {SECTION_BAR}\n{output}")
             results.append((check_name, result))
-        except Exception as e:
-            print(f"❌ Check failed: {e}")
-            results.append((check_name, False))
     
     # Summary
-    print("\n" + "="*80)
-    print("📋 DIAGNOSTIC SUMMARY")
-    print("="*80)
-    
+    lines = ["", BAR_80, "📋 DIAGNOSTIC SUMMARY", BAR_80]
     for check_name, result in results:
-        status = "✅ PASSED" if result else "❌ FAILED"
-        print(f"{check_name:.<40} {status}")
+        if result is SKIPPED:
+            status = "⏭️  SKIPPED"
+        else:
+            status = "✅ PASSED" if result else "❌ FAILED"
+        lines.append(f"{check_name:.<40} {status}")
+    sys.stdout.write('\n'.join(lines) + '\n')
     
     # Determine root cause
-    failed_checks = [name for name, result in results if not result]
+    failed_checks = [name for name, result in results if result is not SKIPPED and not result]
     
     if 'Direct AgentCore Connection' in failed_checks:
         print(f"\n🎯 ROOT CAUSE IDENTIFIED:")
@@ -10,6 +10,7 @@ since AgentCore doesn't support environment variables.
 import boto3
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 def create_parameter_store_config():
     """Create configuration parameters in AWS Systems Manager Parameter Store"""
@@ -29,29 +30,43 @@ def create_parameter_store_config():
     
     created_params = []
     
-    for param_name, param_value in parameters.items():
-        if param_value:
-            try:
-                # Check if parameter already exists
+    def create_parameter(param_name, param_value):
+        ssm_client.put_parameter(
+            Name=param_name,
+            Value=param_value,
+            Type='SecureString' if 'arn' in param_name.lower() else 'String',
+            Description=f'AgentCore Data Agent configuration: {param_name.split("/")[-1]}',
+            Overwrite=True
+        )
+    
+    # Check which parameters already exist with a single batched call
+    names = [name for name, value in parameters.items() if value]
+    try:
+        existing = {param['Name'] for param in ssm_client.get_parameters(Names=names)['Parameters']} if names else set()
+    except Exception as e:
+        print(f"❌ Failed to check existing parameters: {e}")
+        return created_params
+    
+    # Create the missing ones concurrently, then report in the original order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            name: executor.submit(create_parameter, name, value)
+            for name, value in parameters.items()
+            if value and name not in existing
+        }
+        
+        for param_name, param_value in parameters.items():
+            if not param_value:
+                print(f"⚠️  Skipping empty parameter: {param_name}")
+            elif param_name in existing:
+                print(f"✅ Parameter exists: {param_name}")
+            else:
                 try:
-                    existing = ssm_client.get_parameter(Name=param_name)
-                    print(f"✅ Parameter exists: {param_name}")
-                except ssm_client.exceptions.ParameterNotFound:
-                    # Create new parameter
-                    ssm_client.put_parameter(
-                        Name=param_name,
-                        Value=param_value,
-                        Type='SecureString' if 'arn' in param_name.lower() else 'String',
-                        Description=f'AgentCore Data Agent configuration: {param_name.split("/")[-1]}',
-                        Overwrite=True
-                    )
+                    futures[param_name].result()
                     print(f"✅ Created parameter: {param_name}")
                     created_params.append(param_name)
-                
-            except Exception as e:
-                print(f"❌ Failed to create parameter {param_name}: {e}")
-        else:
-            print(f"⚠️  Skipping empty parameter: {param_name}")
+                except Exception as e:
+                    print(f"❌ Failed to create parameter {param_name}: {e}")
     
     return created_params
 
@@ -64,9 +79,8 @@ def create_modified_data_agent():
     with open('backend/agents/agentcore_data_agent.py', 'r') as f:
         original_code = f.read()
     
-    # Create modified version that uses Parameter Store
-    modified_code = original_code.replace(
-        '''def load_config() -> DataAgentConfig:
+    # Replace the environment-variable load_config with one that uses Parameter Store
+    env_load_config = '''def load_config() -> DataAgentConfig:
     """Load configuration from environment variables"""
     # Load from .env file if it exists
     if os.path.exists('.env'):
@@ -82,12 +96,14 @@ def create_modified_data_agent():
         db_secret_arn=os.getenv('DB_SECRET_ARN'),
         database_name=os.getenv('DATABASE_NAME', 'ticket_system'),
         bedrock_model_id=os.getenv('BEDROCK_MODEL_ID', 'us.amazon.nova-pro-v1:0')
-    )''',
-        '''def load_config() -> DataAgentConfig:
+    )'''
+    parameter_store_load_config = '''# Parameter Store client, created once per container
+ssm_client = boto3.client('ssm', region_name='us-west-2')
+
+
+def load_config() -> DataAgentConfig:
     """Load configuration from AWS Systems Manager Parameter Store"""
     try:
-        ssm_client = boto3.client('ssm', region_name='us-west-2')
-        
         # Get parameters from Parameter Store
         parameter_names = [
             '/agentcore/data-agent/aws-region',
@@ -122,7 +138,13 @@ def create_modified_data_agent():
             database_name=os.getenv('DATABASE_NAME', 'ticket_system'),
             bedrock_model_id=os.getenv('BEDROCK_MODEL_ID', 'us.amazon.nova-pro-v1:0')
         )'''
-    )
+    
+    if env_load_config in original_code:
+        modified_code = original_code.replace(env_load_config, parameter_store_load_config)
+    else:
+        # The checked-in agent already reads Parameter Store; copy it unchanged
+        print("✅ Data Agent already loads its configuration from Parameter Store")
+        modified_code = original_code
     
     # Write the modified Data Agent
     modified_path = 'backend/agents/agentcore_data_agent_fixed.py'
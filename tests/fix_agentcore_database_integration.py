@@ -12,28 +12,74 @@ the Data Agent Invoker Lambda.
 Solution: Deploy the updated AgentCore Ticket Agent with Lambda integration.
 """
 
-import os
 import sys
 import subprocess
+import hashlib
 import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from _aws_clients import CONFIG, SESSION
+from _stdout_routing import inherit_output
+
+AGENT_FILE = Path("backend/agents/agentcore_ticket_agent.py")
+
+# Parameter Store entry recording the last deploy whose integration test
+# passed, as JSON: the code digest, runtime ID and runtime version it ran on
+CODE_SHA_PARAMETER = "/agentcore/ticket-agent/code-sha"
+
+# Runtime ID of the agent deployed by deploy_updated_agent, parsed from its ARN
+_deployed_runtime_id = None
+_RUNTIME_ARN_PATTERN = re.compile(r"arn:aws:bedrock-agentcore:[^:\s]*:\d*:runtime/([\w-]+)")
+
+# Markers of the Lambda integration in the agent code; all must be present
+INTEGRATION_MARKERS = ("data-agent-invoker", "lambda_client.invoke")
+_MARKER_PATTERN = re.compile("|".join(map(re.escape, INTEGRATION_MARKERS)))
+
+def poll_until(fn, timeout=120, base=1.0, cap=10.0):
+    """Call fn until it returns True or timeout seconds pass
+    
+    Waits between attempts back off exponentially from base seconds, capped
+    at cap seconds, so a fast propagation is detected within a second or two.
+    """
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        if fn():
+            return True
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        
+        delay = min(cap, base * 2 ** attempt, remaining)
+        print(f"\n⏳ Not live yet, retrying in {delay:.0f}s...")
+        time.sleep(delay)
+        attempt += 1
+
 def check_current_deployment():
     """Check the current AgentCore deployment status"""
     print("🔍 CHECKING CURRENT AGENTCORE DEPLOYMENT")
     print("="*70)
     
     # Check if the updated agent code exists
-    agent_file = Path("backend/agents/agentcore_ticket_agent.py")
+    agent_file = AGENT_FILE
     if not agent_file.exists():
         print("❌ AgentCore Ticket Agent file not found")
         return False
     
-    # Check if the Lambda integration code is present
+    # Check if the Lambda integration code is present, scanning line by line
+    # in a single regex pass and stopping once every marker has been seen
+    found = set()
     with open(agent_file, 'r') as f:
-        content = f.read()
+        for line in f:
+            found.update(_MARKER_PATTERN.findall(line))
+            if len(found) == len(INTEGRATION_MARKERS):
+                break
     
-    if "data-agent-invoker" in content and "lambda_client.invoke" in content:
+    if len(found) == len(INTEGRATION_MARKERS):
         print("✅ Updated AgentCore Ticket Agent code found (with Lambda integration)")
         print("   - Contains Data Agent Invoker Lambda calls")
         print("   - Contains boto3 Lambda client usage")
@@ -45,47 +91,106 @@ def check_current_deployment():
         print("   - Still using fallback data")
         return False
 
+def agent_code_digest():
+    """Short SHA-256 digest of the local AgentCore Ticket Agent code"""
+    return hashlib.sha256(AGENT_FILE.read_bytes()).hexdigest()[:12]
+
+def _agent_runtime(runtime_id):
+    """Return the AgentCore control plane's description of a runtime"""
+    client = SESSION.client('bedrock-agentcore-control', config=CONFIG)
+    return client.get_agent_runtime(agentRuntimeId=runtime_id)
+
+def code_is_deployed(digest):
+    """Check whether this code was verified on the runtime, with nothing deployed since
+    
+    The recorded digest alone isn't enough, since deploys made outside this
+    script don't update it; the runtime must also still be READY at the
+    version the code was verified on.
+    """
+    try:
+        ssm = SESSION.client('ssm', config=CONFIG)
+        record = json.loads(ssm.get_parameter(Name=CODE_SHA_PARAMETER)['Parameter']['Value'])
+        if record['digest'] != digest:
+            return False
+        
+        runtime = _agent_runtime(record['runtime_id'])
+    except Exception:
+        return False
+    
+    return runtime['status'] == 'READY' and runtime['agentRuntimeVersion'] == record['version']
+
+def record_deployed_code(digest, runtime_id):
+    """Remember that digest is live and verified on runtime_id's current version"""
+    if not runtime_id:
+        print("⚠️  Deploy output had no runtime ARN; not recording the deployed code")
+        return
+    
+    try:
+        version = _agent_runtime(runtime_id)['agentRuntimeVersion']
+        ssm = SESSION.client('ssm', config=CONFIG)
+        ssm.put_parameter(
+            Name=CODE_SHA_PARAMETER,
+            Value=json.dumps({'digest': digest, 'runtime_id': runtime_id, 'version': version}),
+            Type='String',
+            Overwrite=True
+        )
+    except Exception as e:
+        print(f"⚠️  Could not record deployed code digest: {e}")
+
 def deploy_updated_agent():
     """Deploy the updated AgentCore Ticket Agent"""
+    global _deployed_runtime_id
     print("\n🚀 DEPLOYING UPDATED AGENTCORE TICKET AGENT")
     print("="*70)
     
     try:
-        # Change to the agents directory
-        os.chdir("backend/agents")
-        
         print("📦 Deploying AgentCore Ticket Agent with Lambda integration...")
         
-        # Deploy the updated agent
-        result = subprocess.run([
+        # Deploy the updated agent from the agents directory, without
+        # changing this process's working directory. Output is streamed live
+        # for progress and kept so the agent ARN can be read afterwards.
+        process = subprocess.Popen([
             "agentcore", "deploy", 
             "--agent", "agentcore_ticket_agent",
             "--auto-update-on-conflict"
-        ], capture_output=True, text=True)
+        ], cwd="backend/agents", stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+        
+        output = []
+        for line in process.stdout:
+            sys.stdout.write(f"   {line}")
+            output.append(line)
+        process.wait()
         
-        if result.returncode == 0:
+        if process.returncode == 0:
             print("✅ AgentCore Ticket Agent deployment successful!")
-            print(f"   Output: {result.stdout}")
             
             # Extract ARN if available
-            if "arn:aws:bedrock-agentcore" in result.stdout:
-                lines = result.stdout.split('\n')
-                for line in lines:
-                    if "arn:aws:bedrock-agentcore" in line:
-                        print(f"   Agent ARN: {line.strip()}")
+            for line in output:
+                if "arn:aws:bedrock-agentcore" in line:
+                    print(f"   Agent ARN: {line.strip()}")
+                    match = _RUNTIME_ARN_PATTERN.search(line)
+                    if match:
+                        _deployed_runtime_id = match.group(1)
             
             return True
         else:
-            print("❌ AgentCore deployment failed!")
-            print(f"   Error: {result.stderr}")
+            print(f"❌ AgentCore deployment failed! (exit code {process.returncode})")
             return False
             
     except Exception as e:
         print(f"❌ Deployment error: {e}")
         return False
-    finally:
-        # Return to original directory
-        os.chdir("../..")
+
+def agent_runtime_ready(runtime_id):
+    """Check whether an AgentCore runtime has finished creating or updating"""
+    try:
+        status = _agent_runtime(runtime_id)['status']
+    except Exception as e:
+        print(f"⚠️  Agent status check failed: {e}")
+        return False
+    
+    print(f"📈 Ticket Agent Status: {status}")
+    return status not in ('CREATING', 'UPDATING')
 
 def test_updated_deployment():
     """Test the updated deployment to verify Lambda integration"""
@@ -93,24 +198,23 @@ def test_updated_deployment():
     print("="*70)
     
     try:
-        # Run the AgentCore Lambda integration test
-        result = subprocess.run([
-            "python", "test_agentcore_lambda_integration.py"
-        ], capture_output=True, text=True)
+        # Run the AgentCore Lambda integration test in-process
+        import test_agentcore_lambda_integration
+        result = test_agentcore_lambda_integration.run()
         
-        if "✅ Using real database data!" in result.stdout:
+        if result['used_real_db']:
             print("✅ Lambda integration working!")
             print("   - AgentCore Ticket Agent successfully calls Data Agent Invoker Lambda")
             print("   - Real database data retrieved")
             return True
-        elif "⚠️  Using fallback data" in result.stdout:
+        elif result['used_fallback']:
             print("❌ Still using fallback data")
             print("   - Lambda integration not working")
             print("   - May need to wait for deployment propagation")
             return False
         else:
             print("⚠️  Test results unclear")
-            print(f"   Output: {result.stdout[:500]}...")
+            print("   See the test output above")
             return False
             
     except Exception as e:
@@ -123,62 +227,91 @@ def verify_lambda_invoker():
     print("="*70)
     
     try:
-        # Test the Lambda invoker directly
-        result = subprocess.run([
-            "python", "test_real_database_with_invoker.py"
-        ], capture_output=True, text=True)
+        # Test the Lambda invoker directly, in-process
+        import test_real_database_with_invoker
+        result = test_real_database_with_invoker.run()
         
-        if "✅ REAL DATABASE DATA RETRIEVED" in result.stdout:
+        if result['real_data']:
             print("✅ Data Agent Invoker Lambda working correctly")
             print("   - Successfully connects to Aurora database")
             print("   - Retrieves real customer and ticket data")
             return True
         else:
             print("❌ Data Agent Invoker Lambda issues")
-            print(f"   Output: {result.stdout[:500]}...")
+            print("   See the test output above")
             return False
             
     except Exception as e:
         print(f"❌ Lambda test error: {e}")
         return False
 
-def main():
-    """Main function to fix the AgentCore database integration"""
+def main(confirm=None):
+    """Main function to fix the AgentCore database integration
+    
+    confirm pre-answers the deploy confirmation; when None, it is asked
+    interactively if a deploy turns out to be needed.
+    """
     print("🎯 FIXING AGENTCORE DATABASE INTEGRATION")
     print("="*70)
     print("Issue: Deployed AgentCore Ticket Agent using fallback data (TKT-TEST789)")
     print("Solution: Deploy updated agent with Data Agent Invoker Lambda integration")
     print()
     
+    # Steps 1 and 2 are independent: check the local agent code while the
+    # Lambda invoker test runs. The file check is submitted first and
+    # finishes almost immediately, keeping its output ahead of the test's.
+    # Both print where this thread does, so fix_all can capture them.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        code_check = executor.submit(inherit_output(check_current_deployment))
+        invoker_check = executor.submit(inherit_output(verify_lambda_invoker))
+        code_ok, invoker_ok = code_check.result(), invoker_check.result()
+    
     # Step 1: Check current deployment
-    if not check_current_deployment():
+    if not code_ok:
         print("\n❌ CANNOT PROCEED: Updated agent code not found")
         return False
     
     # Step 2: Verify Lambda invoker is working
-    if not verify_lambda_invoker():
+    if not invoker_ok:
         print("\n❌ CANNOT PROCEED: Data Agent Invoker Lambda not working")
         return False
     
-    # Step 3: Deploy updated agent
-    print("\n" + "="*70)
-    print("🚀 PROCEEDING WITH DEPLOYMENT")
+    # Step 3: Deploy updated agent, unless this exact code is already live
+    digest = agent_code_digest()
+    deployed = False
     
-    user_input = input("\nDeploy updated AgentCore Ticket Agent? (y/N): ")
-    if user_input.lower() != 'y':
-        print("❌ Deployment cancelled by user")
-        return False
+    if code_is_deployed(digest):
+        print(f"\n✅ Cache hit: code {digest} is already deployed, no deploy needed")
+    else:
+        print("\n" + "="*70)
+        print("🚀 PROCEEDING WITH DEPLOYMENT")
+        
+        if confirm is None:
+            confirm = input("\nDeploy updated AgentCore Ticket Agent? (y/N): ").lower() == 'y'
+        if not confirm:
+            print("❌ Deployment cancelled by user")
+            return False
+        
+        if not deploy_updated_agent():
+            print("\n❌ DEPLOYMENT FAILED")
+            return False
+        
+        deployed = True
     
-    if not deploy_updated_agent():
-        print("\n❌ DEPLOYMENT FAILED")
-        return False
+    # Step 4: Test updated deployment, retrying until it has propagated.
+    # When the deploy reported its runtime, first wait for AgentCore to
+    # report the update as finished, which is cheaper than a full test run
+    print("\n⏳ Waiting for deployment propagation...")
     
-    # Step 4: Test updated deployment
-    print("\n⏳ Waiting 30 seconds for deployment propagation...")
-    import time
-    time.sleep(30)
+    if _deployed_runtime_id:
+        poll_until(lambda: agent_runtime_ready(_deployed_runtime_id))
     
-    if test_updated_deployment():
+    if poll_until(test_updated_deployment):
+        # Only record the code once it is ready and verified, so a deploy
+        # that never went live isn't skipped on the next run
+        if deployed:
+            record_deployed_code(digest, _deployed_runtime_id)
+        
         print("\n🎉 SUCCESS: AgentCore database integration fixed!")
         print("✅ AgentCore Ticket Agent now uses real database data")
         print("✅ Data Agent Invoker Lambda integration working")
@@ -188,8 +321,9 @@ def main():
         print("💡 May need additional time for propagation")
         return False
 
-if __name__ == "__main__":
-    success = main()
+def run(confirm=None):
+    """Fix the AgentCore database integration; returns True once it is verified"""
+    success = main(confirm)
     
     if success:
         print("\n🎯 INTEGRATION FIXED")
@@ -197,4 +331,9 @@ if __name__ == "__main__":
         print("via the Data Agent Invoker Lambda instead of using fallback test data.")
     else:
         print("\n❌ INTEGRATION NOT FIXED")
-        print("Manual intervention may be required to deploy the updated agent.")
\ No newline at end of file
+        print("Manual intervention may be required to deploy the updated agent.")
+    
+    return success
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Apply All Fixes
+
+Runs the API Gateway routing fix, the chat handler configuration fix and the
+AgentCore database integration fix concurrently instead of one after another.
+
+The database integration fix may deploy the AgentCore Ticket Agent, so its
+confirmation is asked before any fix starts. Each fix's output is captured
+and printed once it finishes, so concurrent fixes don't interleave. Run from
+the repository root, like the individual fix scripts.
+"""
+
+import asyncio
+import sys
+from functools import partial
+
+import fix_agentcore_database_integration
+import fix_api_gateway_routing
+import fix_chat_handler_config
+from _stdout_routing import routed_stdout, run_buffered
+
+async def main():
+    """Run every fix concurrently and print a summary"""
+    print("🎯 APPLYING ALL FIXES")
+    print("=" * 70)
+    
+    # Ask before the fixes start: a prompt from a fix running alongside the
+    # others would be hidden in its captured output
+    confirm = input("\nDeploy updated AgentCore Ticket Agent if needed? (y/N): ").lower() == 'y'
+    fixes = [
+        ("AgentCore Database Integration", partial(fix_agentcore_database_integration.run, confirm)),
+        ("API Gateway Routing", fix_api_gateway_routing.run),
+        ("Chat Handler Configuration", fix_chat_handler_config.run),
+    ]
+    
+    with routed_stdout():
+        results = await asyncio.gather(*(
+            asyncio.to_thread(run_buffered, run) for name, run in fixes
+        ))
+    
+    summary = []
+    for (name, run), (result, output) in zip(fixes, results):
+        print(f"\n{'=' * 70}\n{name}\n{'=' * 70}")
+        print(output, end="")
+        summary.append((name, result))
+    
+    print(f"\n📊 SUMMARY")
+    print("=" * 70)
+    for name, result in summary:
+        print(f"{'✅' if result else '❌'} {name}")
+    
+    return all(result for name, result in summary)
+
+if __name__ == "__main__":
+    # Non-zero exit status when any fix fails, so CI notices
+    sys.exit(0 if asyncio.run(main()) else 1)
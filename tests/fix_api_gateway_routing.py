@@ -5,11 +5,27 @@ Fix API Gateway Routing
 This script updates the API Gateway to route /chat requests to the correct Lambda function.
 """
 
-import boto3
 import json
+import sys
+import time
+from functools import lru_cache
+
+# Shared session and client config (keep-alive connections, adaptive retries),
+# so put_integration, create_deployment and the verification calls all reuse
+# one TLS connection to API Gateway
+from _aws_clients import CONFIG, SESSION
+
+# ID of the stage deployment created by fix_api_gateway_routing, if any
+_deployment_id = None
+
+@lru_cache(maxsize=None)
+def _client(service_name, region="us-west-2"):
+    """Return one shared client per service and region"""
+    return SESSION.client(service_name, region_name=region, config=CONFIG)
 
 def fix_api_gateway_routing():
     """Fix the API Gateway routing for the chat endpoint"""
+    global _deployment_id
     print("🔧 FIXING API GATEWAY ROUTING")
     print("=" * 50)
     
@@ -18,12 +34,15 @@ def fix_api_gateway_routing():
     region = "us-west-2"
     account_id = "632930644527"
     
-    # Create API Gateway client
-    apigateway = boto3.client('apigateway', region_name=region)
+    # Get the shared API Gateway client
+    apigateway = _client('apigateway', region)
     
     print(f"🌐 API Gateway ID: {api_id}")
     print(f"📍 Region: {region}")
     
+    # The integration /chat should have
+    new_uri = f"arn:aws:apigateway:{region}:lambda:path/2015-03-31/functions/arn:aws:lambda:{region}:{account_id}:function:ticket-handler/invocations"
+    
     # Get current integration
     print(f"\n🔍 Checking current /chat integration...")
     
@@ -37,12 +56,16 @@ def fix_api_gateway_routing():
         current_uri = current_integration['uri']
         print(f"📋 Current URI: {current_uri}")
         
+        # Only a real change is worth a put_integration and a stage deployment
+        if current_uri == new_uri:
+            print("✅ Integration already points to ticket-handler, no change needed")
+            return True
+        
         if 'chat-handler' in current_uri:
             print("❌ Found the issue: /chat is pointing to old chat-handler function")
-            print("✅ Need to update to point to ticket-handler function")
         else:
-            print("✅ Integration looks correct")
-            return True
+            print("❌ /chat is not pointing to the ticket-handler function")
+        print("✅ Need to update to point to ticket-handler function")
             
     except Exception as e:
         print(f"❌ Error checking current integration: {e}")
@@ -51,8 +74,6 @@ def fix_api_gateway_routing():
     # Update integration to point to ticket-handler
     print(f"\n🔄 Updating /chat integration to use ticket-handler...")
     
-    new_uri = f"arn:aws:apigateway:{region}:lambda:path/2015-03-31/functions/arn:aws:lambda:{region}:{account_id}:function:ticket-handler/invocations"
-    
     try:
         # Update the integration
         response = apigateway.put_integration(
@@ -78,6 +99,7 @@ def fix_api_gateway_routing():
         
         print(f"✅ Deployment successful")
         print(f"📋 Deployment ID: {deployment_response['id']}")
+        _deployment_id = deployment_response['id']
         
         return True
         
@@ -85,35 +107,64 @@ def fix_api_gateway_routing():
         print(f"❌ Error updating integration: {e}")
         return False
 
-def verify_fix():
-    """Verify the fix by checking the integration"""
+def _expo_backoff(base=0.5, cap=10.0, deadline=60):
+    """Yield once per attempt, sleeping with exponential backoff in between
+    
+    Sleeps grow from base seconds up to cap seconds and attempts stop once
+    deadline seconds have passed.
+    """
+    end = time.monotonic() + deadline
+    delay = base
+    while True:
+        yield
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, cap)
+
+def verify_fix(deployment_id=None):
+    """Verify the fix by checking the integration
+    
+    When a deployment was just created, also waits for the prod stage to
+    report it, polling with exponential backoff instead of a one-shot read.
+    """
     print(f"\n🧪 VERIFYING THE FIX")
     print("=" * 30)
     
-    apigateway = boto3.client('apigateway', region_name='us-west-2')
+    apigateway = _client('apigateway')
+    deployment_id = deployment_id or _deployment_id
     
     try:
-        integration = apigateway.get_integration(
-            restApiId='qzd3j8cmn2',
-            resourceId='52xzbm',
-            httpMethod='POST'
-        )
+        for _ in _expo_backoff():
+            integration = apigateway.get_integration(
+                restApiId='qzd3j8cmn2',
+                resourceId='52xzbm',
+                httpMethod='POST'
+            )
+            
+            uri = integration['uri']
+            deployed = (deployment_id is None or
+                        apigateway.get_stage(restApiId='qzd3j8cmn2', stageName='prod')['deploymentId'] == deployment_id)
+            
+            if 'ticket-handler' in uri and deployed:
+                print(f"📋 Current URI: {uri}")
+                print("✅ SUCCESS: /chat now points to ticket-handler")
+                return True
         
-        uri = integration['uri']
         print(f"📋 Current URI: {uri}")
-        
-        if 'ticket-handler' in uri:
-            print("✅ SUCCESS: /chat now points to ticket-handler")
-            return True
+        if not deployed:
+            print(f"❌ ISSUE: prod stage is not yet on deployment {deployment_id}")
         else:
             print("❌ ISSUE: /chat still points to wrong function")
-            return False
+        return False
             
     except Exception as e:
         print(f"❌ Error verifying fix: {e}")
         return False
 
-if __name__ == "__main__":
+def run():
+    """Fix and verify the /chat routing; returns True once the fix is verified"""
     print("🎯 API GATEWAY CHAT ROUTING FIX")
     print("=" * 60)
     print("Issue: Frontend /chat calls are going to old chat-handler function")
@@ -122,6 +173,7 @@ if __name__ == "__main__":
     
     # Fix the routing
     success = fix_api_gateway_routing()
+    verified = False
     
     if success:
         # Verify the fix
@@ -143,4 +195,9 @@ if __name__ == "__main__":
             print("Please check the API Gateway configuration manually")
     else:
         print(f"\n❌ FAILED TO FIX API GATEWAY ROUTING")
-        print("Please check the error messages above")
\ No newline at end of file
+        print("Please check the error messages above")
+    
+    return verified
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
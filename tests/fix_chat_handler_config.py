@@ -5,30 +5,45 @@ Fix Chat Handler Configuration
 Update the Lambda function configuration to ensure it has the correct handler.
 """
 
-import boto3
 import json
+import sys
+from functools import lru_cache
 
-def fix_chat_handler_config():
-    """Fix the chat handler Lambda function configuration"""
+# Shared session and client config (keep-alive connections, adaptive retries)
+from _aws_clients import CONFIG, SESSION
+
+@lru_cache(maxsize=None)
+def _client(service_name, region="us-west-2"):
+    """Return one shared client per service and region"""
+    return SESSION.client(service_name, region_name=region, config=CONFIG)
+
+def fix_chat_handler_config(verbose=True):
+    """Fix the chat handler Lambda function configuration
+    
+    With verbose=False the current configuration isn't fetched and printed
+    first, saving a round trip.
+    """
     print("🔧 FIXING CHAT HANDLER CONFIGURATION")
     print("=" * 50)
     
-    # Initialize Lambda client
-    lambda_client = boto3.client('lambda', region_name='us-west-2')
+    # Get the shared Lambda client
+    lambda_client = _client('lambda')
     
     function_name = 'chat-handler'
     
     try:
         # Get current function configuration
-        response = lambda_client.get_function_configuration(FunctionName=function_name)
-        
-        print(f"📋 Current handler: {response.get('Handler', 'Not set')}")
-        print(f"📋 Current runtime: {response.get('Runtime', 'Not set')}")
+        if verbose:
+            response = lambda_client.get_function_configuration(FunctionName=function_name)
+            
+            print(f"📋 Current handler: {response.get('Handler', 'Not set')}")
+            print(f"📋 Current runtime: {response.get('Runtime', 'Not set')}")
         
         # Update function configuration
         print("🔧 Updating function configuration...")
         
-        lambda_client.update_function_configuration(
+        # The response already carries the updated configuration
+        response = lambda_client.update_function_configuration(
             FunctionName=function_name,
             Handler='chat_handler.lambda_handler',
             Runtime='python3.11',
@@ -38,13 +53,17 @@ def fix_chat_handler_config():
         
         print("✅ Function configuration updated successfully!")
         
-        # Verify the update
-        response = lambda_client.get_function_configuration(FunctionName=function_name)
         print(f"📋 New handler: {response.get('Handler', 'Not set')}")
         print(f"📋 New runtime: {response.get('Runtime', 'Not set')}")
+        return True
         
     except Exception as e:
         print(f"❌ Failed to fix configuration: {e}")
+        return False
+
+def run():
+    """Apply the chat handler configuration fix; returns True on success"""
+    return fix_chat_handler_config()
 
 if __name__ == "__main__":
-    fix_chat_handler_config()
\ No newline at end of file
+    sys.exit(0 if run() else 1)
\ No newline at end of file
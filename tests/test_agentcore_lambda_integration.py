@@ -26,8 +26,14 @@ if env_file.exists():
 sys.path.append('backend/lambda')
 sys.path.append('backend/agents')
 
-async def test_agentcore_lambda_integration():
-    """Test AgentCore Ticket Agent's Lambda integration directly"""
+async def test_agentcore_lambda_integration(report=None):
+    """Test AgentCore Ticket Agent's Lambda integration directly
+    
+    When a report dict is passed, 'used_real_db' and 'used_fallback' are
+    set in it as the tests run.
+    """
+    report = {} if report is None else report
+    report.update(used_real_db=False, used_fallback=False)
     
     print("🔧 TESTING AGENTCORE TICKET AGENT LAMBDA INTEGRATION")
     print("Testing direct call_data_agent_tool function")
@@ -61,9 +67,11 @@ async def test_agentcore_lambda_integration():
             if customer.get('email') == 'fallback.customer@example.com':
                 print(f"   ⚠️  Using fallback data - Lambda call failed")
                 print(f"   Reasoning: {customer_result.get('reasoning', 'Unknown')}")
+                report['used_fallback'] = True
             else:
                 print(f"   ✅ Using real database data!")
                 print(f"   Reasoning: {customer_result.get('reasoning', 'Unknown')}")
+                report['used_real_db'] = True
         else:
             print(f"   ❌ Customer retrieval failed: {customer_result.get('error', 'Unknown')}")
         
@@ -93,6 +101,7 @@ async def test_agentcore_lambda_integration():
                 if tickets and tickets[0].get('ticket_number', '').startswith('TKT-FALLBACK'):
                     print(f"   ⚠️  Using fallback data - Lambda call failed")
                     print(f"   Reasoning: {tickets_result.get('reasoning', 'Unknown')}")
+                    report['used_fallback'] = True
                 else:
                     print(f"   ⚠️  Real ticket {real_ticket_id} not found in results")
                     if tickets:
@@ -100,6 +109,7 @@ async def test_agentcore_lambda_integration():
             else:
                 print(f"   ✅ Using real database data!")
                 print(f"   Reasoning: {tickets_result.get('reasoning', 'Unknown')}")
+                report['used_real_db'] = True
         else:
             print(f"   ❌ Tickets retrieval failed: {tickets_result.get('error', 'Unknown')}")
         
@@ -142,15 +152,27 @@ async def test_agentcore_lambda_integration():
         traceback.print_exc()
         return False
 
+def run():
+    """Run the integration test in-process
+    
+    Returns {'success': bool, 'used_real_db': bool, 'used_fallback': bool}.
+    """
+    report = {}
+    report['success'] = asyncio.run(test_agentcore_lambda_integration(report))
+    return report
+
 if __name__ == "__main__":
     print("🚀 AGENTCORE LAMBDA INTEGRATION TEST")
     print("="*70)
     
-    success = asyncio.run(test_agentcore_lambda_integration())
+    report = run()
     
-    if success:
+    if report['success']:
         print(f"\n🎯 TEST COMPLETE")
         print(f"Check the output above to see if Lambda integration is working")
     else:
         print(f"\n❌ TEST FAILED")
-        print(f"Check the error logs for details")
\ No newline at end of file
+        print(f"Check the error logs for details")
+    
+    # Machine-readable results on the last line, for scripts that run this test
+    print(json.dumps(report))